@@ -5,13 +5,34 @@ from __future__ import annotations
 from datetime import timedelta
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util import dt as dt_util
 
 from .api import TesyCloudApi
-from .const import DOMAIN, CONF_USERNAME, CONF_PASSWORD, CONF_USER_ID, DEFAULT_SCAN_INTERVAL
+from .const import (
+    DOMAIN,
+    CONF_USERNAME,
+    CONF_PASSWORD,
+    CONF_USER_ID,
+    CONF_PUSH_UPDATES,
+    CONF_COALESCE_WINDOW,
+    CONF_SKIP_REDUNDANT,
+    CONF_REDUNDANT_MAX_AGE,
+    CONF_KEEP_RAW,
+    CONF_TARIFF_PRICE,
+    CONF_TARIFF_SCHEDULE,
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_REDUNDANT_MAX_AGE,
+    DEFAULT_RECONCILE_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+)
 from .coordinator import TesyCloudCoordinator
 from .history import TesyHistoryManager
+from .services import async_setup_services, async_unload_services
+from .statistics import TesyStatisticsImporter
+from .tariff import TesyTariffEngine, parse_schedule
 
 PLATFORMS: list[str] = ["climate", "sensor", "binary_sensor"]
 
@@ -22,28 +43,81 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     password = entry.data[CONF_PASSWORD]
     user_id = entry.data[CONF_USER_ID]
 
-    api = TesyCloudApi(session, username, password, user_id, app_id=entry.entry_id.replace("-", "")[:16])
+    api = TesyCloudApi(
+        session,
+        username,
+        password,
+        user_id,
+        app_id=entry.entry_id.replace("-", "")[:16],
+        coalesce_window=entry.options.get(CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW),
+        skip_redundant=entry.options.get(CONF_SKIP_REDUNDANT, False),
+        redundant_max_age=entry.options.get(CONF_REDUNDANT_MAX_AGE, DEFAULT_REDUNDANT_MAX_AGE),
+    )
 
     history = TesyHistoryManager(hass, entry.entry_id, keep_days=30)
     await history.async_load()
 
-    update_interval = timedelta(seconds=DEFAULT_SCAN_INTERVAL)
-    coordinator = TesyCloudCoordinator(hass, api, update_interval, history=history)
+    push = entry.options.get(CONF_PUSH_UPDATES, False)
+    update_interval = timedelta(seconds=DEFAULT_RECONCILE_INTERVAL if push else DEFAULT_SCAN_INTERVAL)
+    coordinator = TesyCloudCoordinator(
+        hass,
+        api,
+        update_interval,
+        history=history,
+        push=push,
+        keep_raw=entry.options.get(CONF_KEEP_RAW, False),
+    )
 
     await coordinator.async_config_entry_first_refresh()
 
+    tariff: TesyTariffEngine | None = None
+    tariff_price = entry.options.get(CONF_TARIFF_PRICE, 0.0)
+    tariff_schedule = entry.options.get(CONF_TARIFF_SCHEDULE, "")
+    if tariff_price or tariff_schedule:
+        devices = coordinator.devices
+        tariff = TesyTariffEngine(
+            parse_schedule(tariff_schedule, tariff_price),
+            history,
+            lambda mac: devices[mac].watt if mac in devices else None,
+        )
+        tariff.rebuild(devices, dt_util.utcnow().timestamp())
+        entry.async_on_unload(history.add_interval_listener(tariff.add_interval))
+
+    statistics = TesyStatisticsImporter(hass, coordinator, history)
+    statistics.async_start()
+    entry.async_on_unload(statistics.async_stop)
+
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
         "api": api,
         "coordinator": coordinator,
         "history": history,
+        "statistics": statistics,
+        "tariff": tariff,
     }
 
+    async def _async_on_stop(_event: Event) -> None:
+        await api.async_close()
+        await history.async_close()
+
+    entry.async_on_unload(hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_on_stop))
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    async_setup_services(hass)
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+        data = hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+        if data is not None:
+            await data["coordinator"].async_shutdown()
+            await data["api"].async_close()
+            await data["history"].async_close()
+        async_unload_services(hass)
     return unload_ok
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await hass.config_entries.async_reload(entry.entry_id)
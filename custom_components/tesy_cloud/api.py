@@ -5,123 +5,219 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-import ssl
-import threading
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
 from typing import Any
 
 import aiohttp
-import paho.mqtt.client as mqtt
 
 from .const import (
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_REDUNDANT_MAX_AGE,
     TESY_API_BASE,
+    TESY_COMMAND_ACK_TIMEOUT,
     TESY_LANG,
+    TESY_MQTT_CONNECT_TIMEOUT,
     TESY_MQTT_HOST,
+    TESY_MQTT_KEEPALIVE,
     TESY_MQTT_PASSWORD,
     TESY_MQTT_PORT,
+    TESY_MQTT_PUBLISH_TIMEOUT,
+    TESY_MQTT_PUSH_TYPES,
+    TESY_MQTT_RECONNECT_MAX_DELAY,
+    TESY_MQTT_RECONNECT_MIN_DELAY,
     TESY_MQTT_USERNAME,
     TESY_MQTT_VERSION,
     TESY_ORIGIN,
 )
+from .mqtt import TesyMqttClient, TesyMqttError
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class TesyCloudError(Exception):
-    """Base error for the MyTESY cloud client."""
-
-
-class TesyCloudAuthError(TesyCloudError):
-    """Authentication/authorization error."""
-
+def state_commands(
+    *, power: bool | None = None, mode: str | None = None, temperature: float | None = None
+) -> list[tuple[str, dict[str, Any]]]:
+    """Build the (command, payload) pairs for a state change, in the order the device expects."""
+    commands: list[tuple[str, dict[str, Any]]] = []
+    if power is not None:
+        commands.append(("onOff", {"status": "on" if power else "off"}))
+    if mode is not None:
+        commands.append(("setMode", {"name": mode}))
+    if temperature is not None:
+        commands.append(("setTemp", {"temp": int(round(temperature))}))
+    return commands
 
-class _TesyMqttPublisher:
-    """Minimal MQTT-over-WebSocket publisher for Tesy cloud commands."""
 
-    def __init__(self, app_id: str) -> None:
-        self._app_id = app_id
-
-    def publish(self, *, mac: str, model: str, token: str, command: str, payload: dict[str, Any], request_type: str = "request") -> None:
-        connect_event = threading.Event()
-        publish_event = threading.Event()
-        result: dict[str, Any] = {"connect_rc": None, "publish_rc": None, "error": None}
+# command -> (state key it sets, payload key carrying the value)
+_COMMAND_STATE_KEYS: dict[str, tuple[str, str]] = {
+    "onOff": ("status", "status"),
+    "setMode": ("mode", "name"),
+    "setTemp": ("temp", "temp"),
+}
 
-        client = mqtt.Client(
-            callback_api_version=mqtt.CallbackAPIVersion.VERSION2,
-            client_id=f"ha_tesy_{self._app_id[:16]}",
-            transport="websockets",
-            protocol=mqtt.MQTTv311,
-        )
-        client.username_pw_set(TESY_MQTT_USERNAME, TESY_MQTT_PASSWORD)
-        client.tls_set(cert_reqs=ssl.CERT_REQUIRED)
-        client.ws_set_options(path="/")
 
-        topic = f"{TESY_MQTT_VERSION}/{mac}/{request_type}/{model}/{token}/{command}"
-        body = json.dumps({"app_id": self._app_id, **payload})
+def _same_value(current: Any, requested: Any) -> bool:
+    if isinstance(requested, (int, float)):
+        try:
+            return float(current) == float(requested)
+        except (TypeError, ValueError):
+            return False
+    return str(current).lower() == str(requested).lower()
 
-        def on_connect(_client: mqtt.Client, _userdata: Any, _flags: Any, reason_code: Any, _properties: Any = None) -> None:
-            rc = getattr(reason_code, "value", reason_code)
-            result["connect_rc"] = int(rc)
-            connect_event.set()
-            if int(rc) == 0:
-                info = _client.publish(topic, body)
-                result["publish_rc"] = int(info.rc)
-                if int(info.rc) != 0:
-                    publish_event.set()
-            else:
-                publish_event.set()
-
-        def on_publish(_client: mqtt.Client, _userdata: Any, _mid: int, _reason_code: Any = None, _properties: Any = None) -> None:
-            publish_event.set()
-
-        def on_disconnect(_client: mqtt.Client, _userdata: Any, _disconnect_flags: Any, reason_code: Any, _properties: Any = None) -> None:
-            rc = getattr(reason_code, "value", reason_code)
-            if rc not in (0, None) and result.get("error") is None:
-                result["error"] = f"disconnect rc={rc}"
-            connect_event.set()
-            publish_event.set()
-
-        client.on_connect = on_connect
-        client.on_publish = on_publish
-        client.on_disconnect = on_disconnect
 
-        try:
-            client.connect(TESY_MQTT_HOST, TESY_MQTT_PORT, keepalive=20)
-            client.loop_start()
+class TesyCloudError(Exception):
+    """Base error for the MyTESY cloud client."""
 
-            if not connect_event.wait(10):
-                raise TesyCloudError("Timed out connecting to Tesy MQTT broker")
 
-            if result["connect_rc"] != 0:
-                raise TesyCloudError(f"Tesy MQTT connect failed: rc={result['connect_rc']}")
+class TesyCloudAuthError(TesyCloudError):
+    """Authentication/authorization error."""
 
-            if not publish_event.wait(10):
-                raise TesyCloudError("Timed out publishing command to Tesy MQTT broker")
 
-            if result.get("publish_rc") not in (0, None):
-                raise TesyCloudError(f"Tesy MQTT publish failed: rc={result['publish_rc']}")
+@dataclass
+class _PendingCommand:
+    """A command waiting out the coalescing window; later calls overwrite ``payload``."""
 
-            if result.get("error"):
-                _LOGGER.debug("Tesy MQTT disconnect note after publish: %s", result["error"])
-        except Exception as err:
-            raise TesyCloudError(str(err)) from err
-        finally:
-            try:
-                client.disconnect()
-            except Exception:
-                pass
-            try:
-                client.loop_stop()
-            except Exception:
-                pass
+    device: dict[str, Any]
+    payload: dict[str, Any]
+    result: asyncio.Future[asyncio.Future[dict[str, Any]]]
 
 
 class TesyCloudApi:
-    def __init__(self, session: aiohttp.ClientSession, username: str, password: str, user_id: str, app_id: str) -> None:
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        username: str,
+        password: str,
+        user_id: str,
+        app_id: str,
+        coalesce_window: float = DEFAULT_COALESCE_WINDOW,
+        skip_redundant: bool = False,
+        redundant_max_age: float = DEFAULT_REDUNDANT_MAX_AGE,
+    ) -> None:
         self._session = session
         self._username = username
         self._password = password
         self._user_id = user_id
-        self._mqtt = _TesyMqttPublisher(app_id=app_id)
+        self._app_id = app_id
+        self._mqtt = TesyMqttClient(
+            session,
+            url=f"wss://{TESY_MQTT_HOST}:{TESY_MQTT_PORT}/",
+            client_id=f"ha_tesy_{app_id[:16]}",
+            username=TESY_MQTT_USERNAME,
+            password=TESY_MQTT_PASSWORD,
+            keepalive=TESY_MQTT_KEEPALIVE,
+            connect_timeout=TESY_MQTT_CONNECT_TIMEOUT,
+            reconnect_min_delay=TESY_MQTT_RECONNECT_MIN_DELAY,
+            reconnect_max_delay=TESY_MQTT_RECONNECT_MAX_DELAY,
+            on_message=self._handle_mqtt_message,
+        )
+        self._push_listeners: list[Callable[[str, str, dict[str, Any]], None]] = []
+        self._pending_acks: dict[tuple[str, str], list[asyncio.Future[dict[str, Any]]]] = {}
+        self._coalesce_window = coalesce_window
+        self._pending_commands: dict[tuple[str, str, str], _PendingCommand] = {}
+        self._flush_tasks: set[asyncio.Task[None]] = set()
+        self.coalesced_commands = 0
+        self._skip_redundant = skip_redundant
+        self._redundant_max_age = redundant_max_age
+        self._state_lookup: Callable[[str, float], dict[str, Any] | None] | None = None
+        self.suppressed_commands = 0
+
+    async def async_close(self) -> None:
+        """Shut down the shared MQTT session."""
+        await self._mqtt.async_close()
+
+    def add_push_listener(self, listener: Callable[[str, str, dict[str, Any]], None]) -> Callable[[], None]:
+        """Register ``listener(mac, command, message)`` for device messages; returns a remover."""
+        self._push_listeners.append(listener)
+
+        def _remove() -> None:
+            if listener in self._push_listeners:
+                self._push_listeners.remove(listener)
+
+        return _remove
+
+    async def async_subscribe_devices(self, macs: Iterable[str]) -> None:
+        """Subscribe to the state/response topics of ``macs`` on the shared MQTT session."""
+        topics = [f"{TESY_MQTT_VERSION}/{mac}/{kind}/#" for mac in macs for kind in TESY_MQTT_PUSH_TYPES]
+        try:
+            await self._mqtt.async_subscribe(topics, timeout=TESY_MQTT_PUBLISH_TIMEOUT)
+        except TesyMqttError as err:
+            raise TesyCloudError(str(err)) from err
+
+    def _handle_mqtt_message(self, topic: str, payload: bytes) -> None:
+        # v1/{mac}/{kind}/{model}/{token}/{command}
+        parts = topic.split("/")
+        if len(parts) < 6 or parts[2] not in TESY_MQTT_PUSH_TYPES:
+            return
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            _LOGGER.debug("Ignoring non-JSON Tesy MQTT message on %s", topic)
+            return
+        if not isinstance(message, dict):
+            return
+        mac, command = parts[1], parts[5]
+        if parts[2] == "response":
+            for future in self._pending_acks.pop((mac, command), ()):
+                if not future.done():
+                    future.set_result(message)
+        for listener in list(self._push_listeners):
+            listener(mac, command, message)
+
+    def _create_ack(self, mac: str, command: str, timeout: float) -> asyncio.Future[dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[dict[str, Any]] = loop.create_future()
+        key = (mac, command)
+        self._pending_acks.setdefault(key, []).append(future)
+
+        def _expire() -> None:
+            if not future.done():
+                future.set_exception(TesyCloudError(f"No response from {mac} to {command} within {timeout:g}s"))
+
+        def _cleanup(fut: asyncio.Future[dict[str, Any]]) -> None:
+            handle.cancel()
+            waiters = self._pending_acks.get(key)
+            if waiters is not None and fut in waiters:
+                waiters.remove(fut)
+                if not waiters:
+                    del self._pending_acks[key]
+            if not fut.cancelled():
+                fut.exception()  # callers may ignore the acknowledgement
+
+        handle = loop.call_later(timeout, _expire)
+        future.add_done_callback(_cleanup)
+        return future
+
+    @property
+    def has_pending_commands(self) -> bool:
+        """Whether a command is waiting to be published or for its acknowledgement."""
+        return bool(self._pending_commands or self._pending_acks)
+
+    def set_state_lookup(self, lookup: Callable[[str, float], dict[str, Any] | None]) -> None:
+        """Set ``lookup(mac, max_age)`` returning the last confirmed state if it is recent enough."""
+        self._state_lookup = lookup
+
+    def _suppressed_ack(self, mac: str, command: str, payload: dict[str, Any]) -> asyncio.Future[dict[str, Any]] | None:
+        """Return a resolved acknowledgement if ``command`` would not change the confirmed state.
+
+        The synthetic acknowledgement is flagged ``suppressed`` so it is not taken
+        for a device response.
+        """
+        if not self._skip_redundant or self._state_lookup is None or command not in _COMMAND_STATE_KEYS:
+            return None
+        state_key, payload_key = _COMMAND_STATE_KEYS[command]
+        if payload_key not in payload:
+            return None
+        state = self._state_lookup(mac, self._redundant_max_age)
+        if not state or state_key not in state or not _same_value(state[state_key], payload[payload_key]):
+            return None
+
+        self.suppressed_commands += 1
+        _LOGGER.debug("Skipping redundant %s for %s: %s already %s", command, mac, state_key, state[state_key])
+        ack: asyncio.Future[dict[str, Any]] = asyncio.get_running_loop().create_future()
+        ack.set_result({"payload": {state_key: state[state_key]}, "suppressed": True})
+        return ack
 
     async def async_get_my_devices(self) -> dict[str, Any]:
         url = f"{TESY_API_BASE}/get-my-devices"
@@ -162,7 +258,117 @@ class TesyCloudApi:
         command: str,
         payload: dict[str, Any],
         request_type: str = "request",
+        timeout: float = TESY_MQTT_CONNECT_TIMEOUT + TESY_MQTT_PUBLISH_TIMEOUT,
+        ack_timeout: float = TESY_COMMAND_ACK_TIMEOUT,
+    ) -> asyncio.Future[dict[str, Any]]:
+        """Publish ``command`` and return a future for the device's response.
+
+        The future resolves with the response message published by the device,
+        or fails with TesyCloudError once ``ack_timeout`` elapses.
+
+        Calls for the same device and command within the coalescing window are
+        collapsed: only the last payload is published and every caller gets
+        the acknowledgement of that publish. With redundant-command skipping
+        enabled, a last payload that matches the confirmed state is not
+        published at all.
+        """
+        mac, _model, _token = self._route(device)
+        if self._coalesce_window <= 0:
+            suppressed = self._suppressed_ack(mac, command, payload)
+            if suppressed is not None:
+                return suppressed
+            return await self._async_publish_command(device, command, payload, request_type, timeout, ack_timeout)
+
+        key = (mac, command, request_type)
+        pending = self._pending_commands.get(key)
+        if pending is not None:
+            pending.device = device
+            pending.payload = payload
+            self.coalesced_commands += 1
+        else:
+            pending = _PendingCommand(device=device, payload=payload, result=asyncio.get_running_loop().create_future())
+            pending.result.add_done_callback(lambda fut: fut.cancelled() or fut.exception())
+            self._pending_commands[key] = pending
+            task = asyncio.create_task(
+                self._async_flush_command(key, pending, request_type, timeout, ack_timeout),
+                name=f"tesy_command_{mac}_{command}",
+            )
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+        # Shielded so one cancelled caller does not cancel the shared publish.
+        return await asyncio.shield(pending.result)
+
+    async def _async_flush_command(
+        self,
+        key: tuple[str, str, str],
+        pending: _PendingCommand,
+        request_type: str,
+        timeout: float,
+        ack_timeout: float,
     ) -> None:
+        await asyncio.sleep(self._coalesce_window)
+        if self._pending_commands.get(key) is not pending:
+            return  # superseded by a command group
+        del self._pending_commands[key]
+        # Checked against the last payload of the window: a later call may have
+        # set the value back to the confirmed state.
+        suppressed = self._suppressed_ack(key[0], key[1], pending.payload)
+        if suppressed is not None:
+            pending.result.set_result(suppressed)
+            return
+        try:
+            ack = await self._async_publish_command(
+                pending.device, key[1], pending.payload, request_type, timeout, ack_timeout
+            )
+        except Exception as err:  # noqa: BLE001
+            pending.result.set_exception(err)
+        else:
+            pending.result.set_result(ack)
+
+    async def async_send_commands(
+        self,
+        device: dict[str, Any],
+        commands: Sequence[tuple[str, dict[str, Any]]],
+        request_type: str = "request",
+        timeout: float = TESY_MQTT_CONNECT_TIMEOUT + TESY_MQTT_PUBLISH_TIMEOUT,
+        ack_timeout: float = TESY_COMMAND_ACK_TIMEOUT,
+    ) -> list[asyncio.Future[dict[str, Any]]]:
+        """Publish an ordered group of commands to one device back to back.
+
+        The group skips the coalescing window so its order is preserved; any
+        coalesced command it overrides is resolved with the group's
+        acknowledgement for the same command. Returns one future per command.
+        """
+        mac, model, token = self._route(device)
+        acks: list[asyncio.Future[dict[str, Any]]] = []
+        sent: list[tuple[str, dict[str, Any]]] = []
+        try:
+            for command, payload in commands:
+                ack = self._suppressed_ack(mac, command, payload)
+                if ack is None:
+                    ack = await self._async_publish(
+                        mac, model, token, command, payload, request_type, timeout, ack_timeout
+                    )
+                    sent.append((command, payload))
+                acks.append(ack)
+        except BaseException:
+            for ack in acks:
+                ack.cancel()
+            raise
+
+        for (command, _payload), ack in zip(commands, acks):
+            pending = self._pending_commands.pop((mac, command, request_type), None)
+            if pending is not None:
+                self.coalesced_commands += 1
+                pending.result.set_result(ack)
+
+        await asyncio.gather(
+            *(self._async_post_app_log(mac=mac, command=command, payload=payload) for command, payload in sent)
+        )
+        return acks
+
+    @staticmethod
+    def _route(device: dict[str, Any]) -> tuple[str, str, str]:
         mac = str(device.get("mac") or (device.get("state") or {}).get("mac") or "").strip()
         model = str(device.get("model") or "").strip()
         token = str(device.get("token") or "").strip()
@@ -171,20 +377,46 @@ class TesyCloudApi:
             raise TesyCloudError(
                 f"Device is missing {','.join(missing)} and cannot be controlled. Available keys: {sorted(device.keys())}"
             )
+        return mac, model, token
 
-        await asyncio.get_running_loop().run_in_executor(
-            None,
-            lambda: self._mqtt.publish(
-                mac=mac,
-                model=model,
-                token=token,
-                command=command,
-                payload=payload,
-                request_type=request_type,
-            ),
-        )
-
+    async def _async_publish_command(
+        self,
+        device: dict[str, Any],
+        command: str,
+        payload: dict[str, Any],
+        request_type: str,
+        timeout: float,
+        ack_timeout: float,
+    ) -> asyncio.Future[dict[str, Any]]:
+        mac, model, token = self._route(device)
+        ack = await self._async_publish(mac, model, token, command, payload, request_type, timeout, ack_timeout)
         await self._async_post_app_log(mac=mac, command=command, payload=payload)
+        return ack
+
+    async def _async_publish(
+        self,
+        mac: str,
+        model: str,
+        token: str,
+        command: str,
+        payload: dict[str, Any],
+        request_type: str,
+        timeout: float,
+        ack_timeout: float,
+    ) -> asyncio.Future[dict[str, Any]]:
+        topic = f"{TESY_MQTT_VERSION}/{mac}/{request_type}/{model}/{token}/{command}"
+        body = json.dumps({"app_id": self._app_id, **payload})
+        ack = self._create_ack(mac, command, ack_timeout)
+        try:
+            await self._mqtt.async_subscribe([f"{TESY_MQTT_VERSION}/{mac}/response/#"], timeout=timeout)
+            await self._mqtt.async_publish(topic, body, timeout=timeout)
+        except TesyMqttError as err:
+            ack.cancel()
+            raise TesyCloudError(str(err)) from err
+        except BaseException:
+            ack.cancel()
+            raise
+        return ack
 
     async def _async_post_app_log(self, *, mac: str, command: str, payload: dict[str, Any]) -> None:
         url = f"{TESY_API_BASE}/app-log"
@@ -209,11 +441,11 @@ class TesyCloudApi:
         except Exception as err:  # noqa: BLE001
             _LOGGER.debug("Tesy app-log POST failed for %s/%s: %s", mac, command, err)
 
-    async def async_set_power(self, device: dict[str, Any], on: bool) -> None:
-        await self.async_send_command(device, "onOff", {"status": "on" if on else "off"})
+    async def async_set_power(self, device: dict[str, Any], on: bool) -> asyncio.Future[dict[str, Any]]:
+        return await self.async_send_command(device, *state_commands(power=on)[0])
 
-    async def async_set_temperature(self, device: dict[str, Any], temperature: float) -> None:
-        await self.async_send_command(device, "setTemp", {"temp": int(round(temperature))})
+    async def async_set_temperature(self, device: dict[str, Any], temperature: float) -> asyncio.Future[dict[str, Any]]:
+        return await self.async_send_command(device, *state_commands(temperature=temperature)[0])
 
-    async def async_set_mode(self, device: dict[str, Any], mode: str) -> None:
-        await self.async_send_command(device, "setMode", {"name": mode})
+    async def async_set_mode(self, device: dict[str, Any], mode: str) -> asyncio.Future[dict[str, Any]]:
+        return await self.async_send_command(device, *state_commands(mode=mode)[0])
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Callable
+from typing import Callable
 
 from homeassistant.components.binary_sensor import BinarySensorEntity, BinarySensorDeviceClass
 from homeassistant.config_entries import ConfigEntry
@@ -13,43 +13,8 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
-from .coordinator import TesyCloudCoordinator
-
-
-def _state_on(v: Any) -> bool:
-    if isinstance(v, str):
-        return v.lower() == "on"
-    if isinstance(v, bool):
-        return v
-    return False
-
-
-def _payload(coordinator: TesyCloudCoordinator, mac: str) -> dict[str, Any]:
-    return (coordinator.data or {}).get(mac) or {}
-
-
-def _device(coordinator: TesyCloudCoordinator, mac: str) -> dict[str, Any]:
-    dev = _payload(coordinator, mac).get("device") or {}
-    return dev if isinstance(dev, dict) else {}
-
-
-def _state(coordinator: TesyCloudCoordinator, mac: str) -> dict[str, Any]:
-    st = _payload(coordinator, mac).get("state") or {}
-    return st if isinstance(st, dict) else {}
-
-
-def _device_info(coordinator: TesyCloudCoordinator, mac: str) -> dict[str, Any]:
-    dev = _device(coordinator, mac)
-    model = dev.get("model_type") or dev.get("model") or "Cloud Convector"
-    sw = dev.get("firmware_version")
-    name = _payload(coordinator, mac).get("name") or f"Tesy Convector {mac.replace(':','')[-6:]}"
-    return {
-        "identifiers": {(DOMAIN, mac)},
-        "manufacturer": "TESY",
-        "name": name,
-        "model": model,
-        "sw_version": sw,
-    }
+from .coordinator import TesyCloudCoordinator, TesyListenerContext
+from .model import TesyDeviceState
 
 
 @dataclass(frozen=True)
@@ -59,7 +24,8 @@ class _BinDesc:
     icon: str | None
     device_class: BinarySensorDeviceClass | None
     entity_category: EntityCategory | None
-    value_fn: Callable[[TesyCloudCoordinator, str], bool]
+    keys: tuple[str, ...]  # coordinator keys value_fn reads (see TesyListenerContext)
+    value_fn: Callable[[TesyDeviceState], bool]
 
 
 BINARY_SENSORS: tuple[_BinDesc, ...] = (
@@ -69,7 +35,8 @@ BINARY_SENSORS: tuple[_BinDesc, ...] = (
         icon="mdi:power",
         device_class=BinarySensorDeviceClass.POWER,
         entity_category=None,
-        value_fn=lambda c, m: _state_on(_state(c, m).get("status")),
+        keys=("status",),
+        value_fn=lambda d: d.is_on,
     ),
     _BinDesc(
         key="heating_active",
@@ -77,7 +44,8 @@ BINARY_SENSORS: tuple[_BinDesc, ...] = (
         icon="mdi:radiator",
         device_class=BinarySensorDeviceClass.HEAT,
         entity_category=None,
-        value_fn=lambda c, m: _state_on(_state(c, m).get("heating")),
+        keys=("heating",),
+        value_fn=lambda d: d.heating,
     ),
     _BinDesc(
         key="window_open_detected",
@@ -85,7 +53,8 @@ BINARY_SENSORS: tuple[_BinDesc, ...] = (
         icon="mdi:window-open-variant",
         device_class=BinarySensorDeviceClass.WINDOW,
         entity_category=None,
-        value_fn=lambda c, m: _state_on(_state(c, m).get("openedWindow")),
+        keys=("openedWindow",),
+        value_fn=lambda d: d.window_open,
     ),
     _BinDesc(
         key="anti_frost",
@@ -93,7 +62,8 @@ BINARY_SENSORS: tuple[_BinDesc, ...] = (
         icon="mdi:snowflake",
         device_class=None,
         entity_category=None,
-        value_fn=lambda c, m: _state_on(_state(c, m).get("antiFrost")),
+        keys=("antiFrost",),
+        value_fn=lambda d: d.anti_frost,
     ),
     _BinDesc(
         key="device_locked",
@@ -101,7 +71,8 @@ BINARY_SENSORS: tuple[_BinDesc, ...] = (
         icon="mdi:lock",
         device_class=BinarySensorDeviceClass.LOCK,
         entity_category=None,
-        value_fn=lambda c, m: _state_on(_state(c, m).get("lockedDevice")),
+        keys=("lockedDevice",),
+        value_fn=lambda d: d.locked,
     ),
     _BinDesc(
         key="uv_enabled",
@@ -109,7 +80,8 @@ BINARY_SENSORS: tuple[_BinDesc, ...] = (
         icon="mdi:weather-sunny-alert",
         device_class=None,
         entity_category=None,
-        value_fn=lambda c, m: _state_on(_state(c, m).get("uv")),
+        keys=("uv",),
+        value_fn=lambda d: d.uv,
     ),
     _BinDesc(
         key="adaptive_start",
@@ -117,7 +89,8 @@ BINARY_SENSORS: tuple[_BinDesc, ...] = (
         icon="mdi:rocket-launch-outline",
         device_class=None,
         entity_category=None,
-        value_fn=lambda c, m: _state_on(_state(c, m).get("adaptiveStart")),
+        keys=("adaptiveStart",),
+        value_fn=lambda d: d.adaptive_start,
     ),
     # Diagnostics
     _BinDesc(
@@ -126,7 +99,8 @@ BINARY_SENSORS: tuple[_BinDesc, ...] = (
         icon="mdi:earth",
         device_class=BinarySensorDeviceClass.CONNECTIVITY,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda c, m: bool(_device(c, m).get("hasInternet")),
+        keys=("device.hasInternet",),
+        value_fn=lambda d: d.has_internet,
     ),
     _BinDesc(
         key="waiting_for_connection",
@@ -134,7 +108,8 @@ BINARY_SENSORS: tuple[_BinDesc, ...] = (
         icon="mdi:lan-disconnect",
         device_class=None,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda c, m: bool(_device(c, m).get("waitingForConnection")),
+        keys=("device.waitingForConnection",),
+        value_fn=lambda d: d.waiting_for_connection,
     ),
 )
 
@@ -153,11 +128,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
 
 class TesyCloudBinarySensor(CoordinatorEntity[TesyCloudCoordinator], BinarySensorEntity):
     def __init__(self, coordinator: TesyCloudCoordinator, mac: str, desc: _BinDesc) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, TesyListenerContext(mac, frozenset(desc.keys)))
         self._mac = mac
         self._desc = desc
 
-        base_name = _payload(coordinator, mac).get("name") or f"Tesy Convector {mac.replace(':','')[-6:]}"
+        base_name = coordinator.devices[mac].name
         self._attr_name = f"{base_name} {desc.name}"
         self._attr_unique_id = f"{mac}_{desc.key}"
         self._attr_icon = desc.icon
@@ -166,8 +141,10 @@ class TesyCloudBinarySensor(CoordinatorEntity[TesyCloudCoordinator], BinarySenso
 
     @property
     def is_on(self) -> bool:
-        return self._desc.value_fn(self.coordinator, self._mac)
+        dev = self.coordinator.devices.get(self._mac)
+        return self._desc.value_fn(dev) if dev is not None else None
 
     @property
     def device_info(self):
-        return _device_info(self.coordinator, self._mac)
+        dev = self.coordinator.devices.get(self._mac)
+        return dev.device_info if dev is not None else None
@@ -3,55 +3,43 @@
 from __future__ import annotations
 
 import asyncio
+import logging
 from typing import Any
 
-from homeassistant.components.climate import ClimateEntity
+import voluptuous as vol
+
+from homeassistant.components.climate import ATTR_HVAC_MODE, ATTR_PRESET_MODE, ClimateEntity
 from homeassistant.components.climate.const import ClimateEntityFeature, HVACAction, HVACMode
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv, entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .api import TesyCloudError
+from .api import TesyCloudError, state_commands
 from .const import DOMAIN
-from .coordinator import TesyCloudCoordinator
+from .coordinator import TesyCloudCoordinator, TesyListenerContext
+from .model import ATTRIBUTE_KEYS, TesyDeviceState
+
+_LOGGER = logging.getLogger(__name__)
 
 PRESET_COMFORT = "comfort"
 PRESET_ECO = "eco"
 PRESET_SLEEP = "sleep"
 PRESET_MODES = [PRESET_COMFORT, PRESET_ECO, PRESET_SLEEP]
 
+SERVICE_SET_STATE = "set_state"
 
-def _payload(coordinator: TesyCloudCoordinator, mac: str) -> dict[str, Any]:
-    payload = (coordinator.data or {}).get(mac) or {}
-    return payload if isinstance(payload, dict) else {}
-
-
-def _state(coordinator: TesyCloudCoordinator, mac: str) -> dict[str, Any]:
-    st = _payload(coordinator, mac).get("state") or {}
-    return st if isinstance(st, dict) else {}
-
-
-def _device(coordinator: TesyCloudCoordinator, mac: str) -> dict[str, Any]:
-    payload = _payload(coordinator, mac)
-    dev = payload.get("device")
-    if isinstance(dev, dict):
-        return dev
-    return payload if isinstance(payload, dict) else {}
-
+# Every state key the entity reads, for TesyListenerContext.
+_CLIMATE_KEYS = frozenset({"current_temp", "temp", *ATTRIBUTE_KEYS})
 
-def _is_on(state: dict[str, Any]) -> bool:
-    s = state.get("status")
-    return isinstance(s, str) and s.lower() == "on"
 
-
-def _hvac_action(state: dict[str, Any]) -> HVACAction:
-    if not _is_on(state):
+def _hvac_action(dev: TesyDeviceState) -> HVACAction:
+    if not dev.is_on:
         return HVACAction.OFF
-    h = state.get("heating")
-    if isinstance(h, str) and h.lower() == "on":
+    if dev.heating:
         return HVACAction.HEATING
     return HVACAction.IDLE
 
@@ -61,6 +49,22 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     entities = [TesyCloudClimate(coordinator, mac) for mac in (coordinator.data or {}).keys()]
     async_add_entities(entities)
 
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_SET_STATE,
+        vol.All(
+            cv.make_entity_service_schema(
+                {
+                    vol.Optional(ATTR_HVAC_MODE): vol.In([HVACMode.OFF, HVACMode.HEAT]),
+                    vol.Optional(ATTR_PRESET_MODE): vol.In(PRESET_MODES),
+                    vol.Optional(ATTR_TEMPERATURE): vol.Coerce(float),
+                }
+            ),
+            cv.has_at_least_one_key(ATTR_HVAC_MODE, ATTR_PRESET_MODE, ATTR_TEMPERATURE),
+        ),
+        "async_set_state",
+    )
+
 
 class TesyCloudClimate(CoordinatorEntity[TesyCloudCoordinator], ClimateEntity):
     _attr_temperature_unit = UnitOfTemperature.CELSIUS
@@ -74,93 +78,79 @@ class TesyCloudClimate(CoordinatorEntity[TesyCloudCoordinator], ClimateEntity):
     )
 
     def __init__(self, coordinator: TesyCloudCoordinator, mac: str) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, TesyListenerContext(mac, _CLIMATE_KEYS))
         self._mac = mac
-        base_name = _payload(coordinator, mac).get("name") or f"Tesy Convector {mac.replace(':', '')[-6:]}"
-        self._attr_name = base_name
+        self._attr_name = coordinator.devices[mac].name
         self._attr_unique_id = mac
 
+    @property
+    def _dev(self) -> TesyDeviceState | None:
+        return self.coordinator.devices.get(self._mac)
+
+    def _raw_device(self) -> dict[str, Any]:
+        dev = self._dev
+        if dev is None:
+            raise HomeAssistantError(f"{self._attr_name} is no longer on the MyTESY account")
+        return dev.raw_device
+
+    @property
+    def available(self) -> bool:
+        return super().available and self._dev is not None
+
     @property
     def device_info(self):
-        dev = _device(self.coordinator, self._mac)
-        model = dev.get("model_type") or dev.get("model") or "Cloud Convector"
-        sw = dev.get("firmware_version")
-        return {
-            "identifiers": {(DOMAIN, self._mac)},
-            "manufacturer": "TESY",
-            "name": self._attr_name,
-            "model": model,
-            "sw_version": sw,
-        }
+        dev = self._dev
+        return dev.device_info if dev is not None else None
 
     @property
     def hvac_mode(self) -> HVACMode:
-        return HVACMode.HEAT if _is_on(_state(self.coordinator, self._mac)) else HVACMode.OFF
+        dev = self._dev
+        return HVACMode.HEAT if dev is not None and dev.is_on else HVACMode.OFF
 
     @property
     def hvac_action(self) -> HVACAction:
-        return _hvac_action(_state(self.coordinator, self._mac))
+        dev = self._dev
+        return _hvac_action(dev) if dev is not None else HVACAction.OFF
 
     @property
     def current_temperature(self) -> float | None:
-        v = _state(self.coordinator, self._mac).get("current_temp")
-        try:
-            return float(v)
-        except Exception:
-            return None
+        dev = self._dev
+        return dev.current_temp if dev is not None else None
 
     @property
     def target_temperature(self) -> float | None:
-        v = _state(self.coordinator, self._mac).get("temp")
-        try:
-            return float(v)
-        except Exception:
-            return None
+        dev = self._dev
+        return dev.target_temp if dev is not None else None
 
     @property
     def preset_mode(self) -> str | None:
-        mode = _state(self.coordinator, self._mac).get("mode")
-        if isinstance(mode, str) and mode in PRESET_MODES:
-            return mode
+        dev = self._dev
+        if dev is not None and dev.mode in PRESET_MODES:
+            return dev.mode
         return None
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
-        st = _state(self.coordinator, self._mac)
-        keys = [
-            "watt",
-            "status",
-            "heating",
-            "openedWindow",
-            "antiFrost",
-            "lockedDevice",
-            "uv",
-            "adaptiveStart",
-            "mode",
-            "programStatus",
-            "timeRemaining",
-            "modeTime",
-            "TCorrection",
-        ]
-        return {k: st.get(k) for k in keys if k in st}
+        dev = self._dev
+        return dict(dev.attributes) if dev is not None else {}
 
     async def async_turn_on(self) -> None:
-        device = _device(self.coordinator, self._mac)
+        device = self._raw_device()
         try:
-            await self.coordinator.api.async_set_power(device, True)
-            self._apply_optimistic_state(status="on")
-            await self._async_refresh_after_command()
+            ack = await self.coordinator.api.async_set_power(device, True)
         except TesyCloudError as err:
             raise HomeAssistantError(f"Failed to turn on for {self._attr_name}: {err}") from err
+        self._apply_optimistic_state(status="on")
+        await self._async_confirm(ack)
 
     async def async_turn_off(self) -> None:
-        device = _device(self.coordinator, self._mac)
+        device = self._raw_device()
         try:
-            await self.coordinator.api.async_set_power(device, False)
-            self._apply_optimistic_state(status="off", heating="off")
-            await self._async_refresh_after_command()
+            ack = await self.coordinator.api.async_set_power(device, False)
         except TesyCloudError as err:
             raise HomeAssistantError(f"Failed to turn off for {self._attr_name}: {err}") from err
+        self._apply_optimistic_state(status="off", heating="off")
+        await self._async_confirm(ack)
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         if hvac_mode == HVACMode.OFF:
@@ -175,32 +165,72 @@ class TesyCloudClimate(CoordinatorEntity[TesyCloudCoordinator], ClimateEntity):
         temperature = kwargs.get(ATTR_TEMPERATURE)
         if temperature is None:
             raise HomeAssistantError(f"No target temperature provided for {self._attr_name}")
-        device = _device(self.coordinator, self._mac)
+        device = self._raw_device()
         try:
-            await self.coordinator.api.async_set_temperature(device, float(temperature))
-            self._apply_optimistic_state(temp=float(temperature))
-            await self._async_refresh_after_command()
+            ack = await self.coordinator.api.async_set_temperature(device, float(temperature))
         except TesyCloudError as err:
             raise HomeAssistantError(f"Failed to set temperature for {self._attr_name}: {err}") from err
+        self._apply_optimistic_state(temp=float(temperature))
+        await self._async_confirm(ack)
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         if preset_mode not in PRESET_MODES:
             raise HomeAssistantError(f"Unsupported preset mode for {self._attr_name}: {preset_mode}")
-        device = _device(self.coordinator, self._mac)
+        device = self._raw_device()
         try:
-            await self.coordinator.api.async_set_mode(device, preset_mode)
-            self._apply_optimistic_state(mode=preset_mode)
-            await self._async_refresh_after_command()
+            ack = await self.coordinator.api.async_set_mode(device, preset_mode)
         except TesyCloudError as err:
             raise HomeAssistantError(f"Failed to set preset for {self._attr_name}: {err}") from err
+        self._apply_optimistic_state(mode=preset_mode)
+        await self._async_confirm(ack)
+
+    async def async_set_state(
+        self,
+        hvac_mode: HVACMode | None = None,
+        preset_mode: str | None = None,
+        temperature: float | None = None,
+    ) -> None:
+        """Apply power, preset and temperature together as one ordered command group."""
+        if hvac_mode is not None and hvac_mode not in (HVACMode.OFF, HVACMode.HEAT):
+            raise HomeAssistantError(f"Unsupported HVAC mode for {self._attr_name}: {hvac_mode}")
+        if preset_mode is not None and preset_mode not in PRESET_MODES:
+            raise HomeAssistantError(f"Unsupported preset mode for {self._attr_name}: {preset_mode}")
+
+        power = None if hvac_mode is None else hvac_mode == HVACMode.HEAT
+        commands = state_commands(power=power, mode=preset_mode, temperature=temperature)
+        device = self._raw_device()
+        try:
+            acks = await self.coordinator.api.async_send_commands(device, commands)
+        except TesyCloudError as err:
+            raise HomeAssistantError(f"Failed to set state for {self._attr_name}: {err}") from err
+
+        changes: dict[str, Any] = {}
+        if power is not None:
+            changes["status"] = "on" if power else "off"
+            if not power:
+                changes["heating"] = "off"
+        if preset_mode is not None:
+            changes["mode"] = preset_mode
+        if temperature is not None:
+            changes["temp"] = float(temperature)
+        self._apply_optimistic_state(**changes)
+        await self._async_confirm(*acks)
 
     def _apply_optimistic_state(self, **changes: Any) -> None:
-        payload = _payload(self.coordinator, self._mac)
-        state = payload.get("state")
-        if isinstance(state, dict):
-            state.update(changes)
-        self.async_write_ha_state()
-
-    async def _async_refresh_after_command(self) -> None:
-        await asyncio.sleep(1.0)
-        await self.coordinator.async_request_refresh()
+        self.coordinator.async_note_command()
+        self.coordinator.async_merge_state(self._mac, changes)
+
+    async def _async_confirm(self, *acks: asyncio.Future[dict[str, Any]]) -> None:
+        """Apply the device's responses, or fall back to a refresh if any is missing."""
+        try:
+            messages = await asyncio.gather(*acks)
+        except TesyCloudError as err:
+            _LOGGER.debug("%s: %s; refreshing from cloud", self._attr_name, err)
+            await self.coordinator.async_request_refresh()
+            return
+        for message in messages:
+            if message.get("suppressed"):
+                # Never sent: show the confirmed value again without refreshing its freshness.
+                self.coordinator.async_merge_state(self._mac, message["payload"])
+            elif not self.coordinator.push:  # push mode already merged them
+                self.coordinator.async_merge_message(self._mac, message)
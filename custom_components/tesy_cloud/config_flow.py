@@ -5,16 +5,36 @@ from __future__ import annotations
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .api import TesyCloudApi, TesyCloudAuthError, TesyCloudError
-from .const import DOMAIN, CONF_USERNAME, CONF_PASSWORD, CONF_USER_ID
+from .const import (
+    DOMAIN,
+    CONF_USERNAME,
+    CONF_PASSWORD,
+    CONF_USER_ID,
+    CONF_PUSH_UPDATES,
+    CONF_COALESCE_WINDOW,
+    CONF_SKIP_REDUNDANT,
+    CONF_REDUNDANT_MAX_AGE,
+    CONF_KEEP_RAW,
+    CONF_TARIFF_PRICE,
+    CONF_TARIFF_SCHEDULE,
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_REDUNDANT_MAX_AGE,
+)
+from .tariff import TariffScheduleError, parse_schedule
 
 
 class TesyCloudConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: config_entries.ConfigEntry) -> config_entries.OptionsFlow:
+        return TesyCloudOptionsFlow(config_entry)
+
     async def async_step_user(self, user_input=None):
         errors = {}
 
@@ -55,3 +75,39 @@ class TesyCloudConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             }
         )
         return self.async_show_form(step_id="user", data_schema=schema, errors=errors)
+
+
+class TesyCloudOptionsFlow(config_entries.OptionsFlow):
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        # Kept under our own name: older Home Assistant does not set config_entry, newer forbids assigning it.
+        self._entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            try:
+                parse_schedule(user_input.get(CONF_TARIFF_SCHEDULE, ""), user_input.get(CONF_TARIFF_PRICE, 0.0))
+            except TariffScheduleError:
+                errors[CONF_TARIFF_SCHEDULE] = "invalid_tariff_schedule"
+            else:
+                return self.async_create_entry(title="", data=user_input)
+
+        options = user_input or self._entry.options
+        schema = vol.Schema(
+            {
+                vol.Optional(CONF_PUSH_UPDATES, default=options.get(CONF_PUSH_UPDATES, False)): bool,
+                vol.Optional(
+                    CONF_COALESCE_WINDOW, default=options.get(CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW)
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=5)),
+                vol.Optional(CONF_SKIP_REDUNDANT, default=options.get(CONF_SKIP_REDUNDANT, False)): bool,
+                vol.Optional(
+                    CONF_REDUNDANT_MAX_AGE, default=options.get(CONF_REDUNDANT_MAX_AGE, DEFAULT_REDUNDANT_MAX_AGE)
+                ): vol.All(vol.Coerce(int), vol.Range(min=10, max=86400)),
+                vol.Optional(CONF_KEEP_RAW, default=options.get(CONF_KEEP_RAW, False)): bool,
+                vol.Optional(CONF_TARIFF_PRICE, default=options.get(CONF_TARIFF_PRICE, 0.0)): vol.All(
+                    vol.Coerce(float), vol.Range(min=0)
+                ),
+                vol.Optional(CONF_TARIFF_SCHEDULE, default=options.get(CONF_TARIFF_SCHEDULE, "")): str,
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
@@ -2,11 +2,40 @@
 
 DOMAIN = "tesy"
 
+EVENT_STATE_CHANGED = f"{DOMAIN}_state_changed"
+
 CONF_USERNAME = "username"
 CONF_PASSWORD = "password"
 CONF_USER_ID = "user_id"
+CONF_PUSH_UPDATES = "push_updates"
+CONF_COALESCE_WINDOW = "coalesce_window"
+CONF_SKIP_REDUNDANT = "skip_redundant_commands"
+CONF_REDUNDANT_MAX_AGE = "redundant_max_age"
+CONF_KEEP_RAW = "keep_raw_payloads"
+CONF_TARIFF_PRICE = "tariff_price"
+CONF_TARIFF_SCHEDULE = "tariff_schedule"
 
 DEFAULT_SCAN_INTERVAL = 30  # seconds
+DEFAULT_RECONCILE_INTERVAL = 300  # seconds, REST poll while push updates are enabled
+# Adaptive polling (see TesyCloudCoordinator._plan_next_poll)
+POLL_FAST_INTERVAL = 10  # seconds, while commands are in flight and after user-set changes
+POLL_FAST_PERIOD = 120  # seconds of fast polling after a command or a status/mode/setpoint change
+POLL_IDLE_INTERVAL = 300  # seconds, when every device is off or nothing was set for POLL_IDLE_AFTER
+POLL_IDLE_AFTER = 900  # seconds without a command or status/mode/setpoint change
+POLL_MAX_BACKOFF = 900  # seconds, cap for the error backoff
+DEFAULT_COALESCE_WINDOW = 0.5  # seconds a command waits for a newer value of itself
+DEFAULT_REDUNDANT_MAX_AGE = 600  # seconds a confirmed state counts as current for dedup
+DEFAULT_BULK_CONCURRENCY = 8  # devices commanded in parallel by tesy.bulk_command
+
+# Temperature ring buffers per device: (bucket seconds, buckets kept) per tier.
+TEMPERATURE_TIERS = ((60, 24 * 60), (15 * 60, 7 * 24 * 4), (3600, 30 * 24))
+
+# Heating analytics: a device is short-cycling when at least SHORT_CYCLE_RATIO of
+# at least SHORT_CYCLE_MIN_CYCLES heating cycles last less than SHORT_CYCLE_SECONDS.
+SHORT_CYCLE_SECONDS = 300
+SHORT_CYCLE_RATIO = 0.5
+SHORT_CYCLE_MIN_CYCLES = 4
+HEATING_METRICS_WINDOW = 24 * 3600  # seconds covered by the heating analytics sensors
 
 TESY_API_BASE = "https://ad.mytesy.com/rest"
 TESY_ORIGIN = "https://v4.mytesy.com"
@@ -17,3 +46,11 @@ TESY_MQTT_PORT = 8083
 TESY_MQTT_USERNAME = "client1"
 TESY_MQTT_PASSWORD = "123"
 TESY_MQTT_VERSION = "v1"
+TESY_MQTT_KEEPALIVE = 60  # seconds
+TESY_MQTT_CONNECT_TIMEOUT = 10  # seconds
+TESY_MQTT_PUBLISH_TIMEOUT = 10  # seconds
+TESY_COMMAND_ACK_TIMEOUT = 10  # seconds to wait for a device response
+TESY_MQTT_RECONNECT_MIN_DELAY = 1  # seconds
+TESY_MQTT_RECONNECT_MAX_DELAY = 120  # seconds
+# Topic types (3rd topic level) on which devices publish their state.
+TESY_MQTT_PUSH_TYPES = ("response", "status")
@@ -1,17 +1,32 @@
-"""Coordinator for MyTESY cloud polling."""
+"""Coordinator for MyTESY cloud polling and MQTT push updates."""
 
 from __future__ import annotations
 
 import logging
+import time
+from dataclasses import dataclass
 from datetime import timedelta
 from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
+from .analytics import heating_summary
 from .api import TesyCloudApi, TesyCloudError
-from .history import TesyHistoryManager
-from .const import DOMAIN
+from .history import TesyHistoryManager, _parse_ts
+from .model import TesyDeviceState, deep_sizeof, project_device, project_state
+from .temperature import TesyTemperatureHistory
+from .const import (
+    DOMAIN,
+    EVENT_STATE_CHANGED,
+    HEATING_METRICS_WINDOW,
+    POLL_FAST_INTERVAL,
+    POLL_FAST_PERIOD,
+    POLL_IDLE_AFTER,
+    POLL_IDLE_INTERVAL,
+    POLL_MAX_BACKOFF,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,6 +40,64 @@ def _guess_device_name(dev_obj: dict[str, Any], mac: str) -> str:
     return f"Tesy Convector {suffix}"
 
 
+# User-set state keys: a change means someone is using the device (worth polling fast).
+# ``heating`` and ``current_temp`` follow the thermostat and change on their own.
+_TRANSITION_KEYS = frozenset({"status", "temp", "mode"})
+
+_MISSING = object()
+
+
+def _diff_keys(old: dict[str, Any], new: dict[str, Any], prefix: str = "") -> set[str]:
+    return {f"{prefix}{k}" for k in old.keys() | new.keys() if old.get(k, _MISSING) != new.get(k, _MISSING)}
+
+
+def _diff_payload(old: dict[str, Any] | None, new: dict[str, Any]) -> set[str]:
+    """Changed keys between two per-device payloads; device-level keys are prefixed with ``device.``."""
+    if old is None:
+        return set(new["state"]) | {f"device.{k}" for k in new["device"]} | {"name"}
+    keys = _diff_keys(old["state"], new["state"])
+    if old["device"] is not new["device"]:
+        keys |= _diff_keys(old["device"], new["device"], "device.")
+    if old["name"] != new["name"]:
+        keys.add("name")
+    return keys
+
+
+@dataclass(frozen=True)
+class TesyListenerContext:
+    """Coordinator listener context of a per-device entity.
+
+    The entity is only woken when ``mac`` changed in one of ``keys`` (state keys,
+    ``device.<key>`` or ``name``; None means any key), or on every REST refresh
+    if ``every_refresh`` is set because its value also depends on time. A
+    single-device merge only wakes ``every_refresh`` entities of that device.
+    """
+
+    mac: str
+    keys: frozenset[str] | None = None
+    every_refresh: bool = False
+
+    def wants(self, changed_keys: dict[str, frozenset[str]], removed: set[str], refresh: bool = True) -> bool:
+        if (self.every_refresh and refresh) or self.mac in removed:
+            return True
+        keys = changed_keys.get(self.mac)
+        if keys is None:
+            return False
+        return self.every_refresh or self.keys is None or not self.keys.isdisjoint(keys)
+
+
+_PUSH_META_KEYS = frozenset({"app_id", "mac", "model", "token", "request_type"})
+
+
+def _push_state(message: dict[str, Any]) -> dict[str, Any]:
+    # Devices either wrap the (partial) state or send it flat next to metadata.
+    for key in ("payload", "state", "data"):
+        inner = message.get(key)
+        if isinstance(inner, dict):
+            return dict(inner)
+    return {k: v for k, v in message.items() if k not in _PUSH_META_KEYS}
+
+
 class TesyCloudCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     def __init__(
         self,
@@ -32,6 +105,8 @@ class TesyCloudCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         api: TesyCloudApi,
         update_interval: timedelta,
         history: TesyHistoryManager | None = None,
+        push: bool = False,
+        keep_raw: bool = False,
     ) -> None:
         super().__init__(
             hass,
@@ -41,12 +116,212 @@ class TesyCloudCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         )
         self.api = api
         self._history = history
+        # Estimated energy is integrated here, once per refresh or merge; sensors only read it.
+        self.energy = history.energy if history is not None else None
+        self.temperatures = TesyTemperatureHistory()
+        self.thermal = history.thermal if history is not None else None
+        self.push = push
+        self.keep_raw = keep_raw
+        # Last state reported by the cloud or the device itself (no optimistic changes).
+        self._confirmed: dict[str, dict[str, Any]] = {}
+        api.set_state_lookup(self.confirmed_state)
+
+        self._base_interval = update_interval
+        self._fast_until = 0.0
+        self._last_change = time.monotonic()  # last command or user-set change, for the idle interval
+        self._error_count = 0
+        self.poll_reason = "base"
+        # What the latest refresh or merge changed: MACs, and per MAC the changed keys.
+        self.changed_macs: set[str] = set()
+        self.changed_keys: dict[str, frozenset[str]] = {}
+        # False while notifying a single-device merge rather than a REST refresh.
+        self._refreshed = True
+        # Parsed view of coordinator.data, rebuilt only for devices that changed.
+        self.devices: dict[str, TesyDeviceState] = {}
+        # Heating analytics per MAC, computed on first read after each refresh.
+        self._summaries: dict[str, dict[str, Any]] = {}
+        self._notified_success: bool | None = None
+        self._remove_push_listener = api.add_push_listener(self._handle_push_message) if push else None
+
+    async def async_shutdown(self) -> None:
+        if self._remove_push_listener is not None:
+            self._remove_push_listener()
+            self._remove_push_listener = None
+        await super().async_shutdown()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Wake only the listeners whose device/keys changed; everyone when availability changes."""
+        notify_all = not self.last_update_success or self._notified_success is not True
+        self._notified_success = self.last_update_success
+        changed = self.changed_keys
+        removed = self.changed_macs - changed.keys()
+        for update_callback, context in list(self._listeners.values()):
+            if (
+                notify_all
+                or not isinstance(context, TesyListenerContext)
+                or context.wants(changed, removed, self._refreshed)
+            ):
+                update_callback()
+
+    @callback
+    def async_note_command(self) -> None:
+        """Poll fast for a while after a command so its effect shows up quickly."""
+        self._last_change = time.monotonic()
+        self._fast_until = self._last_change + POLL_FAST_PERIOD
+        if self.push or self.update_interval is None:
+            return
+        if self.update_interval.total_seconds() > POLL_FAST_INTERVAL:
+            self._set_interval(POLL_FAST_INTERVAL, "command")
+            self._schedule_refresh()
+
+    def _set_interval(self, seconds: float, reason: str) -> None:
+        if self.poll_reason != reason:
+            _LOGGER.debug("Tesy polling every %ss (%s)", seconds, reason)
+        self.update_interval = timedelta(seconds=seconds)
+        self.poll_reason = reason
+
+    def _plan_next_poll(self, first: bool, current: dict[str, Any]) -> None:
+        base = self._base_interval.total_seconds()
+        now = time.monotonic()
+
+        changed = not first and any(not _TRANSITION_KEYS.isdisjoint(keys) for keys in self.changed_keys.values())
+        if changed:
+            self._last_change = now
+            self._fast_until = max(self._fast_until, now + POLL_FAST_PERIOD)
+        pending = self.api.has_pending_commands
+        all_off = all(str(p["state"].get("status", "")).lower() != "on" for p in current.values())
+
+        if not self.push and (pending or now < self._fast_until):
+            self._set_interval(min(POLL_FAST_INTERVAL, base), "transitioning" if changed else "command")
+        elif current and not pending and (all_off or now - self._last_change >= POLL_IDLE_AFTER):
+            self._set_interval(max(POLL_IDLE_INTERVAL, base), "idle")
+        else:
+            self._set_interval(base, "base")
+
+    def memory_footprint(self) -> dict[str, int]:
+        """Approximate bytes retained per device (snapshot payload plus parsed view)."""
+        footprint: dict[str, int] = {}
+        for mac, payload in (self.data or {}).items():
+            seen: set[int] = set()  # the parsed view shares the raw dicts with the payload
+            footprint[mac] = deep_sizeof(payload, seen) + deep_sizeof(self.devices.get(mac), seen)
+        return footprint
+
+    def confirmed_state(self, mac: str, max_age: float) -> dict[str, Any] | None:
+        """Return the last confirmed state of ``mac`` if its updated_at is within ``max_age`` seconds."""
+        state = self._confirmed.get(mac)
+        if state is None:
+            return None
+        ts = _parse_ts(state.get("updated_at"))
+        if ts is None or (dt_util.utcnow() - ts).total_seconds() > max_age:
+            return None
+        return state
+
+    def heating_summary(self, mac: str) -> dict[str, Any] | None:
+        """Heating analytics of ``mac`` over the last HEATING_METRICS_WINDOW, shared by its sensors."""
+        if self._history is None:
+            return None
+        summary = self._summaries.get(mac)
+        if summary is None:
+            now = dt_util.utcnow().timestamp()
+            summary = self._summaries[mac] = heating_summary(self._history, mac, now - HEATING_METRICS_WINDOW, now)
+        return summary
+
+    @callback
+    def async_merge_state(self, mac: str, changes: dict[str, Any]) -> None:
+        """Merge a partial device state into the current snapshot and notify entities.
+
+        This only changes what entities show; energy, temperature and heating
+        history are fed from confirmed states alone (see _record_confirmed).
+        """
+        if not self.data or mac not in self.data or not changes:
+            return
+        payload = self.data[mac]
+        changes = project_state(changes, self.keep_raw)
+        keys = _diff_keys(payload["state"], {**payload["state"], **changes})
+        if not keys:
+            return
+        state = {**payload["state"], **changes}
+        self.data = {**self.data, mac: {**payload, "state": state}}
+        self.devices[mac] = TesyDeviceState(mac, self.data[mac])
+        self.changed_macs = {mac}
+        self.changed_keys = {mac: frozenset(keys)}
+        self._refreshed = False
+        try:
+            self.async_update_listeners()
+        finally:
+            self._refreshed = True
+
+    @callback
+    def async_merge_message(self, mac: str, message: dict[str, Any]) -> None:
+        """Merge the state carried by a device MQTT message (push or command response)."""
+        changes = project_state(_push_state(message), self.keep_raw)
+        if not changes:
+            return
+        observed = dt_util.now()
+        changes.setdefault("updated_at", observed.strftime("%Y-%m-%d %H:%M:%S"))
+        if mac in self._confirmed:
+            old = self._confirmed[mac]
+            self._confirmed[mac] = {**old, **changes}
+            self._fire_state_changed(mac, old, self._confirmed[mac])
+            if not _TRANSITION_KEYS.isdisjoint(_diff_keys(old, self._confirmed[mac])):
+                self._last_change = time.monotonic()
+            self._record_confirmed(mac, observed.timestamp())
+        self.async_merge_state(mac, changes)
+
+    @callback
+    def _record_confirmed(self, mac: str, ts: float) -> None:
+        """Feed the confirmed state of ``mac``, observed at ``ts``, to energy, temperatures, thermal model and history."""
+        payload = (self.data or {}).get(mac)
+        if payload is None:
+            return
+        confirmed = {**payload, "state": self._confirmed[mac]}
+        dev = TesyDeviceState(mac, confirmed)
+        if self.energy is not None:
+            self.energy.update(dev, ts)
+        self.temperatures.add(dev, ts)
+        if self.thermal is not None:
+            self.thermal.update(dev, ts)
+        if self._history is not None:
+            self.hass.async_create_task(self._async_record_history(mac, confirmed))
+
+    async def _async_record_history(self, mac: str, confirmed: dict[str, Any]) -> None:
+        await self._history.process_snapshot({mac: confirmed})
+        # The cached heating summary predates the transition just recorded.
+        self._summaries.pop(mac, None)
+
+    @callback
+    def _fire_state_changed(self, mac: str, old: dict[str, Any], new: dict[str, Any]) -> None:
+        """Fire EVENT_STATE_CHANGED with the fields that differ between two confirmed states."""
+        changes = {
+            key: {"old": old.get(key), "new": new.get(key)}
+            for key in _diff_keys(old, new)
+            if key != "updated_at"
+        }
+        if not changes:
+            return
+        self.hass.bus.async_fire(
+            EVENT_STATE_CHANGED,
+            {
+                "mac": mac,
+                "name": (self.data or {}).get(mac, {}).get("name"),
+                "updated_at": new.get("updated_at"),
+                "changes": changes,
+            },
+        )
+
+    @callback
+    def _handle_push_message(self, mac: str, command: str, message: dict[str, Any]) -> None:
+        _LOGGER.debug("Tesy push update for %s (%s): %s", mac, command, message)
+        self.async_merge_message(mac, message)
 
     async def _async_update_data(self) -> dict[str, Any]:
         try:
             raw = await self.api.async_get_my_devices()
 
+            previous: dict[str, Any] = self.data or {}
             out: dict[str, Any] = {}
+            changed_keys: dict[str, frozenset[str]] = {}
             for mac, dev_obj in raw.items():
                 if not isinstance(dev_obj, dict):
                     continue
@@ -55,16 +330,64 @@ class TesyCloudCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                     state = {}
 
                 mac_str = str(mac)
-                out[mac_str] = {
-                    "device": dev_obj,
-                    "state": state,
+                payload = {
+                    "device": project_device(dev_obj, self.keep_raw),
+                    "state": project_state(state, self.keep_raw),
                     "name": _guess_device_name(dev_obj, mac_str),
                 }
+                old = previous.get(mac_str)
+                keys = _diff_payload(old, payload)
+                if keys or old is None:
+                    out[mac_str] = payload
+                    changed_keys[mac_str] = frozenset(keys)
+                else:
+                    out[mac_str] = old  # structural sharing: unchanged device keeps its object
+
+            removed = previous.keys() - out.keys()
+            self.changed_macs = set(changed_keys) | removed
+            self.changed_keys = changed_keys
+            first = self.data is None
+            if not self.changed_macs and not first:
+                out = previous
+            for mac in removed:
+                self.devices.pop(mac, None)
+            for mac in changed_keys:
+                self.devices[mac] = TesyDeviceState(mac, out[mac])
+            now = dt_util.utcnow().timestamp()
+            if self.energy is not None:
+                self.energy.update_all(self.devices, now)
+            self.temperatures.add_all(self.devices, now)
+            if self.thermal is not None:
+                self.thermal.update_all(self.devices, now)
+
+            confirmed = {mac: payload["state"] for mac, payload in out.items()}
+            # Compared against the last confirmed state, not the displayed one, so changes
+            # already shown optimistically still produce an event (and history) once confirmed.
+            recorded = []
+            for mac, state in confirmed.items():
+                old_state = self._confirmed.get(mac)
+                if old_state is not state:
+                    recorded.append(mac)
+                    if old_state is not None:
+                        self._fire_state_changed(mac, old_state, state)
+            self._confirmed = confirmed
+
+            if self._history is not None and recorded:
+                await self._history.process_snapshot({mac: out[mac] for mac in recorded})
+            self._summaries = {}
 
-            if self._history is not None:
-                await self._history.process_snapshot(out)
+            if self.push:
+                try:
+                    await self.api.async_subscribe_devices(out.keys())
+                except TesyCloudError as err:
+                    _LOGGER.debug("Tesy push subscription failed, relying on polling: %s", err)
 
+            self._error_count = 0
+            self._plan_next_poll(first, out)
             return out
 
         except TesyCloudError as err:
+            self._error_count += 1
+            backoff = self._base_interval.total_seconds() * 2 ** min(self._error_count, 10)
+            self._set_interval(min(backoff, POLL_MAX_BACKOFF), f"error backoff ({self._error_count})")
             raise UpdateFailed(str(err)) from err
@@ -0,0 +1,45 @@
+"""Diagnostics support for MyTESY cloud convectors."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_PASSWORD, CONF_USERNAME, CONF_USER_ID
+
+TO_REDACT = {CONF_USERNAME, CONF_PASSWORD, CONF_USER_ID, "token", "userEmail", "userPass", "userID", "ip", "wifi_ssid"}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    data = hass.data[DOMAIN][entry.entry_id]
+    api = data["api"]
+    coordinator = data["coordinator"]
+    history = data["history"]
+
+    return {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "options": dict(entry.options),
+        "commands": {
+            "coalesced": api.coalesced_commands,
+            "suppressed_redundant": api.suppressed_commands,
+        },
+        "coordinator": {
+            "push": coordinator.push,
+            "update_interval": str(coordinator.update_interval),
+            "poll_reason": coordinator.poll_reason,
+            "last_update_success": coordinator.last_update_success,
+            "device_count": len(coordinator.data or {}),
+            "last_changed": {mac: sorted(keys) for mac, keys in coordinator.changed_keys.items()},
+            "keep_raw": coordinator.keep_raw,
+            "memory_bytes": coordinator.memory_footprint(),
+        },
+        "history": {
+            "last_prune": history.last_prune.isoformat() if history.last_prune else None,
+            "last_pruned_intervals": history.last_pruned,
+            "pruned_intervals_total": history.pruned_total,
+        },
+        "devices": async_redact_data(coordinator.data or {}, TO_REDACT),
+    }
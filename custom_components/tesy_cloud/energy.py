@@ -0,0 +1,89 @@
+"""Per-device estimated energy, integrated once per state update.
+
+Energy is accumulated left-Riemann style: when a new state arrives, the power
+that applied since the previous update (heating on/off times selected watt) is
+charged for the elapsed time, then the new power becomes the one in effect.
+Reading a total never changes it. Totals are persisted by TesyHistoryManager.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+from .model import TesyDeviceState
+
+# Longer gaps between updates (e.g. cloud outages) are only charged up to this.
+MAX_GAP_SECONDS = 6 * 3600
+
+
+class _Meter:
+    __slots__ = ("kwh", "last_ts", "power_w")
+
+    def __init__(self, kwh: float = 0.0) -> None:
+        self.kwh = kwh
+        self.last_ts: float | None = None
+        self.power_w = 0.0
+
+
+class TesyEnergyEngine:
+    """Running kWh estimate per MAC."""
+
+    def __init__(self) -> None:
+        self._meters: dict[str, _Meter] = {}
+        self._stored: set[str] = set()  # MACs whose total came from storage or a restore
+        self.dirty: set[str] = set()  # MACs whose totals changed since the last checkpoint
+
+    def load_json(self, data: Any) -> None:
+        self._meters = {}
+        self._stored = set()
+        self.merge_json(data)
+
+    def merge_json(self, data: Any) -> None:
+        """Apply stored totals (a snapshot or a checkpoint of some MACs) over the current ones."""
+        if isinstance(data, dict):
+            for mac, kwh in data.items():
+                try:
+                    self._meters[mac] = _Meter(float(kwh))
+                except (TypeError, ValueError):
+                    continue
+                self._stored.add(mac)
+        self.dirty = set()
+
+    def to_json(self, macs: Iterable[str] | None = None) -> dict[str, float]:
+        """Totals of ``macs`` (all MACs if None)."""
+        meters = self._meters if macs is None else {mac: self._meters[mac] for mac in macs if mac in self._meters}
+        return {mac: round(meter.kwh, 6) for mac, meter in meters.items()}
+
+    def has_stored(self, mac: str) -> bool:
+        return mac in self._stored
+
+    def seed(self, mac: str, kwh: float) -> None:
+        """Add a previously reported total for ``mac`` (sensor restore on upgrade)."""
+        meter = self._meters.setdefault(mac, _Meter())
+        meter.kwh += kwh
+        self._stored.add(mac)
+        self.dirty.add(mac)
+
+    def total_kwh(self, mac: str) -> float:
+        meter = self._meters.get(mac)
+        return round(meter.kwh, 4) if meter is not None else 0.0
+
+    def update(self, dev: TesyDeviceState, ts: float) -> None:
+        """Charge the previous power up to ``ts``, then switch to ``dev``'s power."""
+        meter = self._meters.get(dev.mac)
+        if meter is None:
+            meter = self._meters[dev.mac] = _Meter()
+        if meter.last_ts is not None:
+            elapsed = ts - meter.last_ts
+            if elapsed < 0:
+                return  # out-of-order update; keep the later baseline
+            if meter.power_w > 0:
+                meter.kwh += meter.power_w * min(elapsed, MAX_GAP_SECONDS) / 3_600_000.0
+                self.dirty.add(dev.mac)
+        meter.last_ts = ts
+        meter.power_w = dev.effective_power_w
+
+    def update_all(self, devices: dict[str, TesyDeviceState], ts: float) -> None:
+        for dev in devices.values():
+            self.update(dev, ts)
@@ -3,35 +3,82 @@
 Stores intervals in Home Assistant .storage via hass.helpers.storage.Store so
 history survives restarts and does not depend on Recorder retention.
 
+Between snapshots every transition is appended to a JSON-lines journal next to
+the Store file. Appends are batched and written in the executor; the journal
+is folded into the snapshot (compaction) once it grows past
+JOURNAL_COMPACT_BYTES and on load, after replaying any entries newer than the
+snapshot's sequence number.
+
 Tracks:
 - device "status" (on/off)
 - device "heating" (on/off)
 
 Intervals are stored per MAC as a list of [start_iso, end_iso] pairs.
 If end_iso is None, interval is currently active.
+
+In memory each track keeps its closed intervals as parallel array('d') of
+epoch seconds plus prefix sums, so on-time queries are two binary searches;
+the ISO list format is only used for storage. Windows that are read
+repeatedly (the sensors' 30 days) also keep a running total that is updated
+on transitions and as intervals slide out, so reading them is O(1).
+
+Alongside the raw intervals (kept for ``keep_days``) every track rolls its
+on-time and transition count into UTC hourly and daily buckets with a longer
+retention, so arbitrary range queries cost one lookup per bucket. The heating
+track also rolls up its energy, charged at the power reported while heating,
+so later imports do not depend on the power selected today.
+
+The estimated energy totals (energy.py) and the thermal model coefficients
+(thermal.py) are persisted here as well: in the snapshot, and as an hourly
+checkpoint entry in the journal that only carries the devices whose values
+changed since the previous checkpoint.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import asyncio
+import json
+import logging
+import math
+import os
+from array import array
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from itertools import islice
+from typing import Any, Callable
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
 from homeassistant.helpers.storage import Store
 from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN
+from .energy import TesyEnergyEngine
+from .thermal import TesyThermalModel
+
+_LOGGER = logging.getLogger(__name__)
 
 STORAGE_VERSION = 1
 
+JOURNAL_FLUSH_DELAY = 10  # seconds to batch transitions before appending
+JOURNAL_COMPACT_BYTES = 1 << 20  # journal size that triggers a snapshot
+PRUNE_INTERVAL = timedelta(hours=1)
 
-def _utcnow() -> datetime:
-    return dt_util.utcnow()
+HOUR = 3600
+DAY = 86400
+HOURLY_KEEP_DAYS = 90
+DAILY_KEEP_DAYS = 800
+
+
+_NAN = float("nan")
 
 
-def _iso(dt: datetime) -> str:
-    return dt_util.as_utc(dt).isoformat()
+def _known(watt: float) -> float | None:
+    return None if math.isnan(watt) else watt
+
+
+def _utcnow() -> datetime:
+    return dt_util.utcnow()
 
 
 def _parse_ts(value: Any) -> datetime | None:
@@ -58,14 +105,375 @@ def _parse_ts(value: Any) -> datetime | None:
         return None
 
 
-@dataclass
+def _epoch(value: Any) -> float | None:
+    if not isinstance(value, str):
+        return None
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _iso_epoch(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
+class _Window:
+    """Running on-time of the closed intervals that still reach into a sliding window."""
+
+    __slots__ = ("span", "head", "closed")
+
+    def __init__(self, span: float, head: int, closed: float) -> None:
+        self.span = span
+        self.head = head  # first interval ending after the window start
+        self.closed = closed  # full duration of intervals[head:]
+
+
+class _Rollup:
+    """On-seconds, transition counts and energy per fixed-size UTC bucket, keyed by bucket index."""
+
+    __slots__ = ("span", "buckets", "kept_from")
+
+    def __init__(self, span: int) -> None:
+        self.span = span
+        # index -> [on_seconds, transitions, kwh]; kwh is missing in buckets stored before it was tracked
+        self.buckets: dict[int, list[float]] = {}
+        self.kept_from = 0.0  # older buckets have been pruned
+
+    @classmethod
+    def from_json(cls, span: int, data: Any) -> _Rollup:
+        rollup = cls(span)
+        if isinstance(data, dict):
+            for idx, value in sorted(data.items(), key=lambda item: int(item[0])):
+                if isinstance(value, list) and len(value) in (2, 3):
+                    rollup.buckets[int(idx)] = [float(v) for v in value]
+        return rollup
+
+    def to_json(self) -> dict[str, list[float]]:
+        # Copied: the snapshot is serialised in the executor while buckets keep changing.
+        return {str(idx): value[:] for idx, value in self.buckets.items()}
+
+    def _bucket(self, idx: int) -> list[float]:
+        bucket = self.buckets.get(idx)
+        if bucket is None:
+            bucket = self.buckets[idx] = [0.0, 0.0]
+        return bucket
+
+    def add_on(self, start: float, end: float) -> None:
+        while start < end:
+            idx = int(start // self.span)
+            step_end = min(end, (idx + 1) * self.span)
+            self._bucket(idx)[0] += step_end - start
+            start = step_end
+
+    def add_energy(self, start: float, end: float, watt: float) -> None:
+        while start < end:
+            idx = int(start // self.span)
+            step_end = min(end, (idx + 1) * self.span)
+            bucket = self._bucket(idx)
+            if len(bucket) == 2:
+                bucket.append(0.0)
+            bucket[2] += watt * (step_end - start) / 3_600_000.0
+            start = step_end
+
+    def add_transition(self, ts: float) -> None:
+        self._bucket(int(ts // self.span))[1] += 1
+
+    def get(self, idx: int) -> tuple[float, float]:
+        bucket = self.buckets.get(idx)
+        return (bucket[0], bucket[1]) if bucket is not None else (0.0, 0.0)
+
+    def get_energy(self, idx: int) -> float | None:
+        """kWh of the bucket; None if it has on-time from before energy was tracked."""
+        bucket = self.buckets.get(idx)
+        if bucket is None:
+            return 0.0
+        return bucket[2] if len(bucket) == 3 else None if bucket[0] else 0.0
+
+    def prune(self, cutoff: float) -> None:
+        # Buckets are created in time order, so only the head needs inspecting.
+        first = int(cutoff // self.span)
+        while self.buckets:
+            idx = next(iter(self.buckets))
+            if idx >= first:
+                break
+            del self.buckets[idx]
+        self.kept_from = max(self.kept_from, first * self.span)
+
+
 class _Track:
-    current_on: bool = False
-    since_iso: str | None = None
-    intervals: list[list[str | None]] = field(default_factory=list)
+    """On/off history of one signal of one device.
+
+    ``starts``/``ends`` hold the closed intervals in time order and
+    ``prefix[i]`` is the on-time of the first ``i`` of them (offset by whatever
+    was pruned); ``watts[i]`` is the mean power recorded over interval ``i``
+    (NaN if it was stored before power was tracked). While on, the open
+    interval starts at ``since``, has been charged ``open_kwh`` up to
+    ``power_since`` and is charged at ``power`` watts from there on.
+    """
+
+    __slots__ = (
+        "current_on",
+        "since",
+        "power",
+        "power_since",
+        "open_kwh",
+        "starts",
+        "ends",
+        "watts",
+        "prefix",
+        "windows",
+        "raw_from",
+        "hourly",
+        "daily",
+    )
+
+    def __init__(self) -> None:
+        self.current_on = False
+        self.since: float | None = None
+        self.power = 0.0
+        self.power_since: float | None = None
+        self.open_kwh = 0.0
+        self.starts = array("d")
+        self.ends = array("d")
+        self.watts = array("d")
+        self.prefix = array("d", [0.0])
+        self.windows: dict[float, _Window] = {}
+        self.raw_from = 0.0  # raw intervals before this have been pruned
+        self.hourly = _Rollup(HOUR)
+        self.daily = _Rollup(DAY)
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> _Track:
+        track = cls()
+        current_on = bool(data.get("current_on"))
+        has_rollups = "hourly" in data and "daily" in data
+        if has_rollups:
+            track.hourly = _Rollup.from_json(HOUR, data["hourly"])
+            track.daily = _Rollup.from_json(DAY, data["daily"])
+        for item in data.get("intervals") or []:
+            if not isinstance(item, list) or len(item) not in (2, 3):
+                continue
+            start = _epoch(item[0])
+            if start is None:
+                continue
+            end = _epoch(item[1])
+            if end is not None:
+                track._append(start, end, float(item[2]) if len(item) == 3 else _NAN)
+                if not has_rollups:  # stored before rollups existed
+                    track._rollup_closed()
+            elif current_on:
+                track.since = start
+        track.current_on = current_on
+        if current_on and track.since is None:
+            track.since = _epoch(data.get("since_iso"))
+        if current_on and track.since is not None and not has_rollups:
+            track._rollup_transition(track.since)
+        if current_on and track.since is not None:
+            track.power = float(data.get("power") or 0.0)
+            track.power_since = _epoch(data.get("power_since_iso")) or track.since
+            track.open_kwh = float(data.get("open_kwh") or 0.0)
+        return track
+
+    def to_json(self) -> dict[str, Any]:
+        intervals: list[list[Any]] = [
+            [_iso_epoch(start), _iso_epoch(end)] if math.isnan(watt) else [_iso_epoch(start), _iso_epoch(end), watt]
+            for start, end, watt in zip(self.starts, self.ends, self.watts)
+        ]
+        since_iso = _iso_epoch(self.since) if self.current_on and self.since is not None else None
+        if since_iso is not None:
+            intervals.append([since_iso, None])
+        data: dict[str, Any] = {
+            "current_on": self.current_on,
+            "since_iso": since_iso,
+            "intervals": intervals,
+            "hourly": self.hourly.to_json(),
+            "daily": self.daily.to_json(),
+        }
+        if since_iso is not None and self.power_since is not None:
+            data["power"] = self.power
+            data["power_since_iso"] = _iso_epoch(self.power_since)
+            data["open_kwh"] = self.open_kwh
+        return data
+
+    def _rollup_transition(self, ts: float) -> None:
+        self.hourly.add_transition(ts)
+        self.daily.add_transition(ts)
+
+    def _rollup_closed(self) -> None:
+        # The last appended interval, after clamping: its on-time and both edges.
+        start, end = self.starts[-1], self.ends[-1]
+        self.hourly.add_on(start, end)
+        self.daily.add_on(start, end)
+        self._rollup_transition(start)
+        self._rollup_transition(end)
+
+    def _append(self, start: float, end: float, watt: float = _NAN) -> None:
+        # Keep intervals ordered and non-overlapping even if device clocks jump back.
+        if self.ends and start < self.ends[-1]:
+            start = self.ends[-1]
+        if end < start:
+            end = start
+        self.starts.append(start)
+        self.ends.append(end)
+        self.watts.append(watt)
+        self.prefix.append(self.prefix[-1] + (end - start))
+        for window in self.windows.values():
+            window.closed += end - start
+
+    def _rollup_energy(self, end: float) -> None:
+        # Charge the open interval from power_since up to ``end`` at the power in effect.
+        start = self.power_since if self.power_since is not None else end
+        self.hourly.add_energy(start, end, self.power)
+        self.daily.add_energy(start, end, self.power)
+        self.open_kwh += self.power * max(0.0, end - start) / 3_600_000.0
+        self.power_since = end
+
+    def open_power(self, now: float) -> float | None:
+        """Mean power of the open interval so far; None while off."""
+        if not self.current_on or self.since is None or self.power_since is None:
+            return None
+        if now <= self.since:
+            return self.power
+        kwh = self.open_kwh + self.power * max(0.0, now - self.power_since) / 3_600_000.0
+        return kwh * 3_600_000.0 / (now - self.since)
+
+    def apply(self, new_on: bool, ts: float, power: float = 0.0) -> bool:
+        if new_on == self.current_on:
+            return False
+        if new_on:
+            self.current_on = True
+            self.since = self.power_since = ts
+            self.power = power
+            self.open_kwh = 0.0
+            self._rollup_transition(ts)
+        else:
+            self.current_on = False
+            self._append(self.since if self.since is not None else ts, ts)
+            self.hourly.add_on(self.starts[-1], self.ends[-1])
+            self.daily.add_on(self.starts[-1], self.ends[-1])
+            if self.power_since is not None:
+                self.power_since = max(self.power_since, self.starts[-1])
+            self._rollup_energy(self.ends[-1])
+            duration = self.ends[-1] - self.starts[-1]
+            self.watts[-1] = self.open_kwh * 3_600_000.0 / duration if duration > 0 else self.power
+            self._rollup_transition(self.ends[-1])
+            self.since = self.power_since = None
+            self.power = self.open_kwh = 0.0
+        return True
+
+    def set_power(self, power: float, ts: float) -> bool:
+        """Switch the open interval to ``power`` watts from ``ts`` on; False if nothing changed."""
+        if not self.current_on or power == self.power or (self.power_since is not None and ts < self.power_since):
+            return False
+        self._rollup_energy(ts)
+        self.power = power
+        return True
+
+    def hourly_energy(self, start: float, now: float) -> float | None:
+        """kWh within the hour starting at ``start``; None where only on-time was recorded."""
+        if start < self.hourly.kept_from:
+            return 0.0
+        kwh = self.hourly.get_energy(int(start // HOUR))
+        if kwh is not None and self.current_on and self.power_since is not None:
+            kwh += self.power * max(0.0, min(start + HOUR, now) - max(start, self.power_since)) / 3_600_000.0
+        return kwh
+
+    def prune(self, cutoff: float) -> int:
+        """Drop intervals that ended before ``cutoff``; returns how many."""
+        count = bisect_left(self.ends, cutoff)
+        if count:
+            for window in self.windows.values():
+                if window.head < count:
+                    window.closed -= self.prefix[count] - self.prefix[window.head]
+                window.head = max(0, window.head - count)
+            del self.starts[:count]
+            del self.ends[:count]
+            del self.watts[:count]
+            del self.prefix[:count]
+        self.raw_from = max(self.raw_from, cutoff)
+        return count
+
+    def raw_between(self, start: float, end: float, now: float) -> tuple[float, float]:
+        """On-seconds and transitions within [start, end) from the raw intervals."""
+        first = bisect_right(self.ends, start)
+        last = bisect_left(self.starts, end)
+        on = 0.0
+        if first < last:
+            on = self.prefix[last] - self.prefix[first]
+            on -= max(0.0, start - self.starts[first])
+            on -= max(0.0, self.ends[last - 1] - end)
+        transitions = float(
+            (bisect_left(self.starts, end) - bisect_left(self.starts, start))
+            + (bisect_left(self.ends, end) - bisect_left(self.ends, start))
+        )
+        if self.current_on and self.since is not None:
+            on += max(0.0, min(end, now) - max(start, self.since))
+            if start <= self.since < end:
+                transitions += 1
+        return on, transitions
+
+    def between(self, start: float, end: float, now: float) -> tuple[float, float]:
+        """On-seconds and transitions within [start, end), one lookup per bucket.
+
+        Whole UTC days come from the daily rollup, whole hours from the hourly
+        rollup and partial hours from the raw intervals; partial buckets that
+        are older than the finer retention are prorated from the coarser one.
+        """
+        on = transitions = 0.0
+        t = start
+        while t < end:
+            if t % DAY == 0 and t + DAY <= end:
+                step_end = t + DAY
+                bucket_on, bucket_count = self.daily.get(int(t // DAY))
+            elif t % HOUR == 0 and t + HOUR <= end and t >= self.hourly.kept_from:
+                step_end = t + HOUR
+                bucket_on, bucket_count = self.hourly.get(int(t // HOUR))
+            else:
+                step_end = min(end, (t // HOUR + 1) * HOUR)
+                if t >= self.raw_from:
+                    bucket_on, bucket_count = self.raw_between(t, step_end, now)
+                    # raw_between already includes the open interval.
+                    on += bucket_on
+                    transitions += bucket_count
+                    t = step_end
+                    continue
+                rollup = self.hourly if t >= self.hourly.kept_from else self.daily
+                share = (step_end - t) / rollup.span
+                bucket_on, bucket_count = rollup.get(int(t // rollup.span))
+                bucket_on, bucket_count = bucket_on * share, bucket_count * share
+            on += bucket_on
+            transitions += bucket_count
+            if self.current_on and self.since is not None:
+                # The open interval is only rolled up once it closes.
+                on += max(0.0, min(step_end, now) - max(t, self.since))
+            t = step_end
+        return on, transitions
+
+    def window_seconds(self, span: float, now: float) -> float:
+        """On-time within the last ``span`` seconds, from the window's running total."""
+        window_start = now - span
+        window = self.windows.get(span)
+        if window is None:
+            head = bisect_right(self.ends, window_start)
+            window = self.windows[span] = _Window(span, head, self.prefix[-1] - self.prefix[head])
+        else:
+            # Amortised O(1): each interval leaves the window exactly once.
+            head, count = window.head, len(self.ends)
+            while head < count and self.ends[head] <= window_start:
+                window.closed -= self.ends[head] - self.starts[head]
+                head += 1
+            window.head = head
 
-    def normalize(self) -> None:
-        self.intervals = [i for i in self.intervals if isinstance(i, list) and len(i) == 2]
+        total = window.closed
+        if window.head < len(self.starts) and self.starts[window.head] < window_start:
+            total -= window_start - self.starts[window.head]
+        if self.current_on and self.since is not None:
+            total += max(0.0, now - max(self.since, window_start))
+        return max(0.0, total)
 
 
 class TesyHistoryManager:
@@ -74,89 +482,221 @@ class TesyHistoryManager:
         self.entry_id = entry_id
         self.keep_days = keep_days
         self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}_{entry_id}_history")
+        self._journal_path = hass.config.path(".storage", f"{DOMAIN}_{entry_id}_history.journal")
         self._data: dict[str, dict[str, _Track]] = {}
+        self._interval_listeners: list[Callable[[str, str, float, float, float | None], None]] = []
+        self.energy = TesyEnergyEngine()
+        self.thermal = TesyThermalModel()
         self._loaded = False
+        self._seq = 0  # last journalled transition
+        self._journal_bytes = 0  # bytes appended to the journal file since the last snapshot
+        self._pending: list[str] = []  # serialised entries not yet appended
+        self._unsub_flush: CALLBACK_TYPE | None = None
+        self._unsub_prune: CALLBACK_TYPE | None = None
+        self._io_lock = asyncio.Lock()
+        self.last_prune: datetime | None = None
+        self.last_pruned = 0  # intervals dropped by the last prune run
+        self.pruned_total = 0
 
     async def async_load(self) -> None:
         stored = await self._store.async_load()
         self._data = {}
+        self._seq = 0
         if stored and isinstance(stored, dict):
+            self._seq = int(stored.get("seq") or 0)
+            self.energy.load_json(stored.get("energy"))
+            self.thermal.load_json(stored.get("thermal"))
             for mac, per in (stored.get("devices") or {}).items():
                 if not isinstance(per, dict):
                     continue
                 status = per.get("status") if isinstance(per.get("status"), dict) else {}
                 heating = per.get("heating") if isinstance(per.get("heating"), dict) else {}
                 self._data[mac] = {
-                    "status": _Track(**status),
-                    "heating": _Track(**heating),
+                    "status": _Track.from_json(status),
+                    "heating": _Track.from_json(heating),
                 }
-                self._data[mac]["status"].normalize()
-                self._data[mac]["heating"].normalize()
+
+        replayed = 0
+        for line in await self.hass.async_add_executor_job(self._read_journal):
+            try:
+                entry = json.loads(line)
+                seq = entry["seq"]
+                if seq <= self._seq:
+                    continue
+                if "energy" in entry or "thermal" in entry:
+                    if "energy" in entry:
+                        self.energy.merge_json(entry["energy"])
+                    if "thermal" in entry:
+                        self.thermal.merge_json(entry["thermal"])
+                elif entry["key"] in ("status", "heating"):
+                    track = self._ensure(entry["mac"])[entry["key"]]
+                    power = float(entry.get("power") or 0.0)
+                    if "on" in entry:
+                        track.apply(bool(entry["on"]), float(entry["ts"]), power)
+                    else:
+                        track.set_power(power, float(entry["ts"]))
+            except (ValueError, TypeError, KeyError):
+                continue  # torn tail from a crash mid-append
+            self._seq = seq
+            replayed += 1
+        if replayed:
+            _LOGGER.debug("Replayed %s history transitions from journal", replayed)
 
         self._loaded = True
         self.prune_all(_utcnow())
-        await self._save()
+        await self._async_compact()
+        if self._unsub_prune is None:
+            self._unsub_prune = async_track_time_interval(self.hass, self._scheduled_prune, PRUNE_INTERVAL)
+
+    async def async_close(self) -> None:
+        """Append any batched transitions; call on unload/stop."""
+        if self._unsub_prune is not None:
+            self._unsub_prune()
+            self._unsub_prune = None
+        self._checkpoint()
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        await self._async_flush()
+
+    def _read_journal(self) -> list[str]:
+        try:
+            with open(self._journal_path, encoding="utf-8") as journal:
+                return journal.read().splitlines()
+        except FileNotFoundError:
+            return []
+
+    def _append_journal(self, lines: list[str]) -> None:
+        with open(self._journal_path, "a", encoding="utf-8") as journal:
+            journal.write("".join(f"{line}\n" for line in lines))
+            journal.flush()
+            os.fsync(journal.fileno())
+
+    def _truncate_journal(self) -> None:
+        try:
+            os.remove(self._journal_path)
+        except FileNotFoundError:
+            pass
+
+    def _journal(self, mac: str, key: str, on: bool | None, ts: float, power: float = 0.0) -> None:
+        entry: dict[str, Any] = {"mac": mac, "key": key, "ts": ts}
+        if on is not None:
+            entry["on"] = on
+        if power:
+            entry["power"] = power
+        self._append_entry(entry)
+
+    def _checkpoint(self) -> None:
+        entry: dict[str, Any] = {}
+        if self.energy.dirty:
+            entry["energy"] = self.energy.to_json(self.energy.dirty)
+            self.energy.dirty = set()
+        if self.thermal.dirty:
+            entry["thermal"] = self.thermal.to_json(self.thermal.dirty)
+            self.thermal.dirty = set()
+        if entry:
+            self._append_entry(entry)
+
+    def _append_entry(self, entry: dict[str, Any]) -> None:
+        self._seq += 1
+        self._pending.append(json.dumps({"seq": self._seq, **entry}))
+        if self._unsub_flush is None:
+            self._unsub_flush = async_call_later(self.hass, JOURNAL_FLUSH_DELAY, self._scheduled_flush)
+
+    @callback
+    def _scheduled_flush(self, _now: datetime) -> None:
+        self._unsub_flush = None
+        self.hass.async_create_task(self._async_flush())
+
+    async def _async_flush(self) -> None:
+        async with self._io_lock:
+            lines, self._pending = self._pending, []
+            if lines:
+                await self.hass.async_add_executor_job(self._append_journal, lines)
+                self._journal_bytes += sum(len(line) + 1 for line in lines)  # entries are ASCII JSON
+            compact = self._journal_bytes >= JOURNAL_COMPACT_BYTES
+        if compact:
+            await self._async_compact()
+
+    async def _async_compact(self) -> None:
+        """Write a full snapshot, then drop the journal it supersedes."""
+        if self.hass.is_stopping:
+            # Store defers writes to the final write while stopping; the journal must outlive that.
+            return
+        async with self._io_lock:
+            # Batched entries are covered by the snapshot; replay skips seq <= snapshot seq.
+            self._pending = []
+            await self._save()
+            await self.hass.async_add_executor_job(self._truncate_journal)
+            self._journal_bytes = 0
 
     async def _save(self) -> None:
+        self.energy.dirty = set()
+        self.thermal.dirty = set()
         payload = {
+            "seq": self._seq,
+            "energy": self.energy.to_json(),
+            "thermal": self.thermal.to_json(),
             "devices": {
                 mac: {
-                    "status": {
-                        "current_on": tr["status"].current_on,
-                        "since_iso": tr["status"].since_iso,
-                        "intervals": tr["status"].intervals,
-                    },
-                    "heating": {
-                        "current_on": tr["heating"].current_on,
-                        "since_iso": tr["heating"].since_iso,
-                        "intervals": tr["heating"].intervals,
-                    },
+                    "status": tr["status"].to_json(),
+                    "heating": tr["heating"].to_json(),
                 }
                 for mac, tr in self._data.items()
             }
         }
         await self._store.async_save(payload)
 
+    @callback
+    def add_interval_listener(
+        self, listener: Callable[[str, str, float, float, float | None], None]
+    ) -> CALLBACK_TYPE:
+        """Call ``listener(mac, key, start, end, watt)`` whenever an on-interval closes.
+
+        ``watt`` is the mean power recorded over the interval.
+        """
+        self._interval_listeners.append(listener)
+
+        @callback
+        def _remove() -> None:
+            self._interval_listeners.remove(listener)
+
+        return _remove
+
     def _ensure(self, mac: str) -> dict[str, _Track]:
         if mac not in self._data:
             self._data[mac] = {"status": _Track(), "heating": _Track()}
         return self._data[mac]
 
-    def prune_all(self, now: datetime) -> None:
-        cutoff = now - timedelta(days=self.keep_days + 2)  # small buffer
-        cutoff_iso = _iso(cutoff)
-        for mac in list(self._data.keys()):
-            for key in ("status", "heating"):
-                track = self._data[mac][key]
-                pruned: list[list[str | None]] = []
-                for start_iso, end_iso in track.intervals:
-                    if end_iso is None or end_iso >= cutoff_iso:
-                        pruned.append([start_iso, end_iso])
-                track.intervals = pruned
-
-    def _apply_transition(self, track: _Track, new_on: bool, ts: datetime) -> bool:
-        if new_on == track.current_on:
-            return False
-        ts_iso = _iso(ts)
-        if new_on:
-            track.current_on = True
-            track.since_iso = ts_iso
-            track.intervals.append([ts_iso, None])
-        else:
-            track.current_on = False
-            if track.intervals and track.intervals[-1][1] is None:
-                track.intervals[-1][1] = ts_iso
-            else:
-                track.intervals.append([ts_iso, ts_iso])
-            track.since_iso = None
-        return True
+    def prune_all(self, now: datetime) -> int:
+        """Drop intervals older than the retention; only each track's head is inspected."""
+        cutoff = (now - timedelta(days=self.keep_days + 2)).timestamp()  # small buffer
+        dropped = 0
+        hourly_cutoff = (now - timedelta(days=HOURLY_KEEP_DAYS)).timestamp()
+        daily_cutoff = (now - timedelta(days=DAILY_KEEP_DAYS)).timestamp()
+        for tracks in self._data.values():
+            for track in tracks.values():
+                if track.ends and track.ends[0] < cutoff:
+                    dropped += track.prune(cutoff)
+                track.hourly.prune(hourly_cutoff)
+                track.daily.prune(daily_cutoff)
+        self.last_prune = now
+        self.last_pruned = dropped
+        self.pruned_total += dropped
+        return dropped
+
+    @callback
+    def _scheduled_prune(self, now: datetime) -> None:
+        self._checkpoint()
+        dropped = self.prune_all(now)
+        if dropped:
+            _LOGGER.debug("Pruned %s history intervals", dropped)
 
     async def process_snapshot(self, snapshot: dict[str, Any]) -> None:
         if not self._loaded:
             await self.async_load()
 
         now = _utcnow()
-        changed = False
 
         for mac, payload in (snapshot or {}).items():
             if not isinstance(payload, dict):
@@ -165,47 +705,146 @@ class TesyHistoryManager:
             if not isinstance(st, dict):
                 continue
 
-            ts = _parse_ts(st.get("updated_at")) or now
+            ts = (_parse_ts(st.get("updated_at")) or now).timestamp()
 
             status_on = str(st.get("status", "")).lower() == "on"
             heating_on = str(st.get("heating", "")).lower() == "on"
-
-            tracks = self._ensure(mac)
-            if self._apply_transition(tracks["status"], status_on, ts):
-                changed = True
-            if self._apply_transition(tracks["heating"], heating_on, ts):
-                changed = True
-
-        self.prune_all(now)
-        if changed:
-            await self._save()
-
-    def _duration_seconds_in_window(self, intervals: list[list[str | None]], now: datetime, days: int) -> float:
-        window_start = now - timedelta(days=days)
-        total = 0.0
-        for start_iso, end_iso in intervals:
             try:
-                start = datetime.fromisoformat(start_iso)
-                if start.tzinfo is None:
-                    start = start.replace(tzinfo=timezone.utc)
-                end = datetime.fromisoformat(end_iso) if end_iso else now
-                if end.tzinfo is None:
-                    end = end.replace(tzinfo=timezone.utc)
-            except Exception:
-                continue
+                power = float(st.get("watt") or 0.0)
+            except (TypeError, ValueError):
+                power = 0.0
 
-            if end < window_start:
-                continue
-            if start < window_start:
-                start = window_start
-            if end > now:
-                end = now
-            if end > start:
-                total += (end - start).total_seconds()
-        return total
+            tracks = self._ensure(mac)
+            for key, on in (("status", status_on), ("heating", heating_on)):
+                track = tracks[key]
+                key_power = power if key == "heating" else 0.0
+                if not track.apply(on, ts, key_power):
+                    if track.set_power(key_power, ts):
+                        self._journal(mac, key, None, ts, key_power)
+                    continue
+                self._journal(mac, key, on, ts, key_power if on else 0.0)
+                if not on:
+                    for listener in self._interval_listeners:
+                        listener(mac, key, track.starts[-1], track.ends[-1], _known(track.watts[-1]))
 
     def get_hours_last_days(self, mac: str, key: str, days: int = 30) -> float:
         now = _utcnow()
         track = self._ensure(mac)[key]
-        seconds = self._duration_seconds_in_window(track.intervals, now, days)
+        seconds = track.window_seconds(days * 86400.0, now.timestamp())
         return round(seconds / 3600.0, 3)
+
+    def query(self, mac: str, key: str, start: datetime, end: datetime) -> dict[str, Any] | None:
+        """On-time and transition count of ``key`` for ``mac`` within [start, end)."""
+        tracks = self._data.get(mac)
+        if tracks is None:
+            return None
+        on, transitions = tracks[key].between(start.timestamp(), end.timestamp(), _utcnow().timestamp())
+        return {
+            "on_seconds": round(on, 1),
+            "on_hours": round(on / 3600.0, 3),
+            "transitions": int(round(transitions)),
+        }
+
+    def first_hour(self, mac: str, key: str) -> datetime | None:
+        """Start of the oldest hour ``key`` has data for, if any."""
+        tracks = self._data.get(mac)
+        if tracks is None:
+            return None
+        track = tracks[key]
+        candidates = [float(idx * HOUR) for idx in islice(track.hourly.buckets, 1)]
+        if track.starts:
+            candidates.append(track.starts[0] // HOUR * HOUR)
+        if track.current_on and track.since is not None:
+            candidates.append(track.since // HOUR * HOUR)
+        if not candidates:
+            return None
+        return datetime.fromtimestamp(max(min(candidates), track.hourly.kept_from), timezone.utc)
+
+    def hourly_on_seconds(self, mac: str, key: str, start: datetime, hours: int) -> list[float]:
+        """On-seconds of ``key`` for each of ``hours`` whole hours from ``start``."""
+        tracks = self._data.get(mac)
+        if tracks is None:
+            return [0.0] * hours
+        track = tracks[key]
+        now = _utcnow().timestamp()
+        first = start.timestamp()
+        return [track.between(first + i * HOUR, first + (i + 1) * HOUR, now)[0] for i in range(hours)]
+
+    def hourly_energy_kwh(self, mac: str, start: datetime, hours: int, fallback_watt: float) -> list[float]:
+        """Heating energy for each of ``hours`` whole hours from ``start``, at the power recorded then.
+
+        Hours stored before energy was tracked are charged at ``fallback_watt``.
+        """
+        tracks = self._data.get(mac)
+        if tracks is None:
+            return [0.0] * hours
+        track = tracks["heating"]
+        now = _utcnow().timestamp()
+        first = start.timestamp()
+        out = []
+        for i in range(hours):
+            t = first + i * HOUR
+            kwh = track.hourly_energy(t, now)
+            if kwh is None:
+                kwh = track.between(t, t + HOUR, now)[0] * fallback_watt / 3_600_000.0
+            out.append(kwh)
+        return out
+
+    def intervals(self, mac: str, key: str, start: float, end: float) -> tuple[array, array]:
+        """Raw on-intervals of ``key`` clipped to [start, end) as (starts, ends) arrays.
+
+        The open interval, if any, is included up to now. Slicing keeps this a
+        couple of C-level copies regardless of how many intervals match.
+        """
+        tracks = self._data.get(mac)
+        if tracks is None:
+            return array("d"), array("d")
+        track = tracks[key]
+        first = bisect_right(track.ends, start)
+        last = bisect_left(track.starts, end)
+        starts = track.starts[first:last]
+        ends = track.ends[first:last]
+        if track.current_on and track.since is not None and track.since < end:
+            starts.append(track.since)
+            ends.append(min(end, _utcnow().timestamp()))
+        if starts:
+            starts[0] = max(starts[0], start)
+            ends[-1] = min(ends[-1], end)
+        return starts, ends
+
+    def closed_intervals(self, mac: str, key: str, start: float, end: float) -> tuple[array, array]:
+        """Closed on-intervals of ``key`` lying entirely within [start, end), unclipped."""
+        tracks = self._data.get(mac)
+        if tracks is None:
+            return array("d"), array("d")
+        track = tracks[key]
+        first = bisect_left(track.starts, start)
+        last = max(first, bisect_right(track.ends, end))
+        return track.starts[first:last], track.ends[first:last]
+
+    def powered_intervals(self, mac: str, key: str, start: float, end: float) -> list[tuple[float, float, float | None]]:
+        """Closed on-intervals of ``key`` clipped to [start, end), with the mean power recorded over each.
+
+        The power is None for intervals stored before power was tracked.
+        """
+        tracks = self._data.get(mac)
+        if tracks is None:
+            return []
+        track = tracks[key]
+        first = bisect_right(track.ends, start)
+        last = bisect_left(track.starts, end)
+        return [
+            (max(track.starts[i], start), min(track.ends[i], end), _known(track.watts[i])) for i in range(first, last)
+        ]
+
+    def open_power(self, mac: str, key: str, now: float) -> float | None:
+        """Mean power recorded over the currently open interval of ``key``; None while off."""
+        tracks = self._data.get(mac)
+        return tracks[key].open_power(now) if tracks is not None else None
+
+    def open_since(self, mac: str, key: str) -> float | None:
+        """Start of the currently open interval of ``key``, if it is on."""
+        tracks = self._data.get(mac)
+        if tracks is None or not tracks[key].current_on:
+            return None
+        return tracks[key].since
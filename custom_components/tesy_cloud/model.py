@@ -0,0 +1,238 @@
+"""Typed per-device view of the MyTESY snapshot, parsed once per refresh."""
+
+from __future__ import annotations
+
+import sys
+from typing import Any
+
+from .const import DOMAIN
+
+
+def _safe_float(v: Any) -> float | None:
+    try:
+        if v is None:
+            return None
+        return float(v)
+    except Exception:
+        return None
+
+
+def _safe_int(v: Any) -> int | None:
+    try:
+        if v is None:
+            return None
+        return int(float(v))
+    except Exception:
+        return None
+
+
+def _state_on(v: Any) -> bool:
+    if isinstance(v, str):
+        return v.lower() == "on"
+    if isinstance(v, bool):
+        return v
+    return False
+
+
+def _sub(state: dict[str, Any], key: str) -> dict[str, Any]:
+    value = state.get(key)
+    return value if isinstance(value, dict) else {}
+
+
+# State keys exposed as climate attributes, in display order.
+ATTRIBUTE_KEYS = (
+    "watt",
+    "status",
+    "heating",
+    "openedWindow",
+    "antiFrost",
+    "lockedDevice",
+    "uv",
+    "adaptiveStart",
+    "mode",
+    "programStatus",
+    "timeRemaining",
+    "modeTime",
+    "TCorrection",
+)
+
+
+# Raw fields the integration reads; everything else is dropped by project_device()/project_state().
+DEVICE_FIELDS = frozenset(
+    {
+        "mac",
+        "model",
+        "token",
+        "model_type",
+        "deviceName",
+        "firmware_version",
+        "wifi_ssid",
+        "ip",
+        "timezone",
+        "hasInternet",
+        "waitingForConnection",
+    }
+)
+STATE_FIELDS = frozenset(
+    {
+        "mac",
+        "updated_at",
+        "current_temp",
+        "temp",
+        "comfortTemp",
+        "ecoTemp",
+        "sleepMode",
+        "delayedStart",
+        *ATTRIBUTE_KEYS,
+    }
+)
+
+
+def _intern(value: Any) -> Any:
+    # Mode names, "on"/"off", model and timezone repeat across the whole fleet.
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, dict):
+        return {sys.intern(k) if isinstance(k, str) else k: _intern(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_intern(v) for v in value]
+    return value
+
+
+def project_state(state: dict[str, Any], keep_raw: bool = False) -> dict[str, Any]:
+    """Keep only the state fields the integration reads (all of them if ``keep_raw``), interned."""
+    return {sys.intern(k): _intern(v) for k, v in state.items() if keep_raw or k in STATE_FIELDS}
+
+
+def project_device(dev_obj: dict[str, Any], keep_raw: bool = False) -> dict[str, Any]:
+    """Keep only the device fields the integration reads (all but ``state`` if ``keep_raw``), interned.
+
+    ``state`` is dropped, but a MAC reported only there is kept as the device's ``mac``.
+    """
+    device = {
+        sys.intern(k): _intern(v)
+        for k, v in dev_obj.items()
+        if k != "state" and (keep_raw or k in DEVICE_FIELDS)
+    }
+    if not device.get("mac"):
+        state = dev_obj.get("state")
+        mac = state.get("mac") if isinstance(state, dict) else None
+        if mac:
+            device["mac"] = _intern(mac)
+    return device
+
+
+def deep_sizeof(obj: Any, _seen: set[int] | None = None) -> int:
+    """Approximate retained size of ``obj`` in bytes, following containers and ``__slots__``."""
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(v, seen) for v in obj)
+    elif hasattr(type(obj), "__slots__"):
+        size += sum(deep_sizeof(getattr(obj, slot, None), seen) for slot in type(obj).__slots__)
+    return size
+
+
+class TesyDeviceState:
+    """Pre-coerced view of one device payload (``device``/``state``/``name``); rebuilt, never mutated."""
+
+    __slots__ = (
+        "mac",
+        "name",
+        "raw_device",
+        "raw_state",
+        "attributes",
+        "is_on",
+        "heating",
+        "current_temp",
+        "target_temp",
+        "mode",
+        "watt",
+        "program_status",
+        "time_remaining",
+        "mode_time",
+        "temp_correction",
+        "comfort_temp",
+        "eco_temp",
+        "eco_time",
+        "sleep_time",
+        "delayed_start_time",
+        "delayed_start_temp",
+        "window_open",
+        "anti_frost",
+        "locked",
+        "uv",
+        "adaptive_start",
+        "model",
+        "firmware_version",
+        "wifi_ssid",
+        "ip",
+        "timezone",
+        "has_internet",
+        "waiting_for_connection",
+    )
+
+    def __init__(self, mac: str, payload: dict[str, Any]) -> None:
+        device = payload.get("device")
+        state = payload.get("state")
+        device = device if isinstance(device, dict) else {}
+        state = state if isinstance(state, dict) else {}
+
+        self.mac = mac
+        self.name: str = payload.get("name") or f"Tesy Convector {mac.replace(':', '')[-6:]}"
+        self.raw_device = device
+        self.raw_state = state
+        self.attributes = {k: state[k] for k in ATTRIBUTE_KEYS if k in state}
+
+        self.is_on = _state_on(state.get("status"))
+        self.heating = _state_on(state.get("heating"))
+        self.current_temp = _safe_float(state.get("current_temp"))
+        self.target_temp = _safe_float(state.get("temp"))
+        mode = state.get("mode")
+        self.mode: str | None = mode if isinstance(mode, str) else None
+        self.watt = _safe_float(state.get("watt"))
+        self.program_status = state.get("programStatus")
+        self.time_remaining = _safe_int(state.get("timeRemaining"))
+        self.mode_time = _safe_int(state.get("modeTime"))
+        self.temp_correction = _safe_float(state.get("TCorrection"))
+        self.comfort_temp = _safe_float(_sub(state, "comfortTemp").get("temp"))
+        self.eco_temp = _safe_float(_sub(state, "ecoTemp").get("temp"))
+        self.eco_time = _safe_int(_sub(state, "ecoTemp").get("time"))
+        self.sleep_time = _safe_int(_sub(state, "sleepMode").get("time"))
+        self.delayed_start_time = _safe_int(_sub(state, "delayedStart").get("time"))
+        self.delayed_start_temp = _safe_float(_sub(state, "delayedStart").get("temp"))
+        self.window_open = _state_on(state.get("openedWindow"))
+        self.anti_frost = _state_on(state.get("antiFrost"))
+        self.locked = _state_on(state.get("lockedDevice"))
+        self.uv = _state_on(state.get("uv"))
+        self.adaptive_start = _state_on(state.get("adaptiveStart"))
+
+        self.model = device.get("model_type") or device.get("model") or "Cloud Convector"
+        self.firmware_version = device.get("firmware_version")
+        self.wifi_ssid = device.get("wifi_ssid")
+        self.ip = device.get("ip")
+        self.timezone = device.get("timezone")
+        self.has_internet = bool(device.get("hasInternet"))
+        self.waiting_for_connection = bool(device.get("waitingForConnection"))
+
+    @property
+    def effective_power_w(self) -> float:
+        """Selected heater power while heating, otherwise 0."""
+        if not self.heating or self.watt is None:
+            return 0.0
+        return self.watt
+
+    @property
+    def device_info(self) -> dict[str, Any]:
+        return {
+            "identifiers": {(DOMAIN, self.mac)},
+            "manufacturer": "TESY",
+            "name": self.name,
+            "model": self.model,
+            "sw_version": self.firmware_version,
+        }
@@ -0,0 +1,335 @@
+"""Minimal asyncio-native MQTT 3.1.1 client over aiohttp WebSockets.
+
+Only what the Tesy cloud needs is implemented: CONNECT with username and
+password, QoS 0 PUBLISH in both directions, SUBSCRIBE, keepalive pings and
+DISCONNECT. Everything runs on the event loop; no executor or helper threads
+are used.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable, Iterable
+
+import aiohttp
+
+_LOGGER = logging.getLogger(__name__)
+
+_CONNECT = 0x10
+_CONNACK = 0x20
+_PUBLISH = 0x30
+_SUBSCRIBE = 0x82
+_SUBACK = 0x90
+_PINGREQ = 0xC0
+_PINGRESP = 0xD0
+_DISCONNECT = 0xE0
+
+_PROTOCOL_NAME = b"MQTT"
+_PROTOCOL_LEVEL = 4  # MQTT 3.1.1
+_CONNECT_FLAGS = 0x80 | 0x40 | 0x02  # username, password, clean session
+
+
+class TesyMqttError(Exception):
+    """Transport-level MQTT error."""
+
+
+def _encode_length(length: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = length % 128
+        length //= 128
+        if length:
+            byte |= 0x80
+        out.append(byte)
+        if not length:
+            return bytes(out)
+
+
+def _encode_str(value: str | bytes) -> bytes:
+    data = value.encode() if isinstance(value, str) else value
+    return len(data).to_bytes(2, "big") + data
+
+
+def _packet(header: int, body: bytes = b"") -> bytes:
+    return bytes((header,)) + _encode_length(len(body)) + body
+
+
+def _split_packets(buf: bytearray) -> list[tuple[int, bytes]]:
+    """Consume every complete packet from ``buf`` and return (header, body) pairs."""
+    packets: list[tuple[int, bytes]] = []
+    while len(buf) >= 2:
+        multiplier = 1
+        length = 0
+        pos = 1
+        while True:
+            if pos >= len(buf):
+                return packets
+            byte = buf[pos]
+            length += (byte & 0x7F) * multiplier
+            multiplier *= 128
+            pos += 1
+            if not byte & 0x80:
+                break
+            if pos > 4:
+                raise TesyMqttError("Malformed MQTT remaining length")
+        if len(buf) < pos + length:
+            return packets
+        packets.append((buf[0], bytes(buf[pos : pos + length])))
+        del buf[: pos + length]
+    return packets
+
+
+class TesyMqttClient:
+    """Lazily connected, auto-reconnecting MQTT session running on the event loop."""
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        *,
+        url: str,
+        client_id: str,
+        username: str,
+        password: str,
+        keepalive: int,
+        connect_timeout: float,
+        reconnect_min_delay: float,
+        reconnect_max_delay: float,
+        on_message: Callable[[str, bytes], None] | None = None,
+    ) -> None:
+        self._session = session
+        self._url = url
+        self._client_id = client_id
+        self._username = username
+        self._password = password
+        self._keepalive = keepalive
+        self._connect_timeout = connect_timeout
+        self._reconnect_min_delay = reconnect_min_delay
+        self._reconnect_max_delay = reconnect_max_delay
+        self._on_message = on_message
+
+        self._ws: aiohttp.ClientWebSocketResponse | None = None
+        self._reader_task: asyncio.Task[None] | None = None
+        self._ping_task: asyncio.Task[None] | None = None
+        self._reconnect_task: asyncio.Task[None] | None = None
+        self._subscriptions: set[str] = set()
+        self._packet_id = 0
+        self._connack: asyncio.Future[int] | None = None
+        self._connect_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+        self._backoff = 0.0
+        self._next_attempt = 0.0
+        self._last_rx = 0.0
+        self._closed = False
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None and not self._ws.closed
+
+    async def async_publish(self, topic: str, payload: str | bytes, *, timeout: float) -> None:
+        """Publish a QoS 0 message, connecting first if needed."""
+        body = _encode_str(topic) + (payload.encode() if isinstance(payload, str) else payload)
+        try:
+            async with asyncio.timeout(timeout):
+                ws = await self._async_ensure_connected()
+                await self._async_send(ws, _packet(_PUBLISH, body))
+        except TimeoutError as err:
+            raise TesyMqttError("Timed out publishing command to Tesy MQTT broker") from err
+
+    async def async_subscribe(self, topics: Iterable[str], *, timeout: float) -> None:
+        """Subscribe to ``topics`` (QoS 0); subscriptions are restored after reconnects."""
+        new = [topic for topic in topics if topic not in self._subscriptions]
+        if not new:
+            return
+        self._subscriptions.update(new)
+        ws = self._ws
+        if ws is None or ws.closed:
+            # Connecting sends every recorded subscription.
+            self._start_reconnect()
+            return
+        try:
+            async with asyncio.timeout(timeout):
+                await self._async_send(ws, self._subscribe_packet(new))
+        except TimeoutError as err:
+            raise TesyMqttError("Timed out subscribing to Tesy MQTT topics") from err
+
+    async def async_close(self) -> None:
+        self._closed = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        ws = self._ws
+        if ws is not None and not ws.closed:
+            try:
+                await self._async_send(ws, _packet(_DISCONNECT))
+            except TesyMqttError:
+                pass
+        await self._async_teardown()
+
+    async def _async_ensure_connected(self) -> aiohttp.ClientWebSocketResponse:
+        if self._closed:
+            raise TesyMqttError("Tesy MQTT session is closed")
+        ws = self._ws
+        if ws is not None and not ws.closed:
+            return ws
+
+        async with self._connect_lock:
+            ws = self._ws
+            if ws is not None and not ws.closed:
+                return ws
+
+            delay = self._next_attempt - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            try:
+                async with asyncio.timeout(self._connect_timeout):
+                    ws = await self._async_connect()
+            except (aiohttp.ClientError, TimeoutError, TesyMqttError) as err:
+                await self._async_teardown()
+                self._backoff = min(max(self._backoff * 2, self._reconnect_min_delay), self._reconnect_max_delay)
+                self._next_attempt = time.monotonic() + self._backoff
+                raise TesyMqttError(f"Tesy MQTT connect failed: {err or type(err).__name__}") from err
+
+            self._backoff = 0.0
+            self._next_attempt = 0.0
+            return ws
+
+    async def _async_connect(self) -> aiohttp.ClientWebSocketResponse:
+        ws = await self._session.ws_connect(self._url, protocols=("mqtt",), autoping=True)
+        self._last_rx = time.monotonic()
+        self._connack = asyncio.get_running_loop().create_future()
+        reader = asyncio.create_task(self._async_read_loop(ws), name="tesy_mqtt_reader")
+
+        body = (
+            _encode_str(_PROTOCOL_NAME)
+            + bytes((_PROTOCOL_LEVEL, _CONNECT_FLAGS))
+            + self._keepalive.to_bytes(2, "big")
+            + _encode_str(self._client_id)
+            + _encode_str(self._username)
+            + _encode_str(self._password)
+        )
+        try:
+            await self._async_send(ws, _packet(_CONNECT, body))
+            rc = await self._connack
+            if rc != 0:
+                raise TesyMqttError(f"broker refused connection: rc={rc}")
+        except BaseException:
+            reader.cancel()
+            await ws.close()
+            raise
+
+        if self._subscriptions:
+            try:
+                await self._async_send(ws, self._subscribe_packet(sorted(self._subscriptions)))
+            except BaseException:
+                reader.cancel()
+                await ws.close()
+                raise
+
+        self._ws = ws
+        self._reader_task = reader
+        self._ping_task = asyncio.create_task(self._async_ping_loop(ws), name="tesy_mqtt_keepalive")
+        _LOGGER.debug("Tesy MQTT session connected")
+        return ws
+
+    def _subscribe_packet(self, topics: Iterable[str]) -> bytes:
+        self._packet_id = self._packet_id % 0xFFFF + 1
+        body = self._packet_id.to_bytes(2, "big") + b"".join(_encode_str(topic) + b"\x00" for topic in topics)
+        return _packet(_SUBSCRIBE, body)
+
+    async def _async_send(self, ws: aiohttp.ClientWebSocketResponse, data: bytes) -> None:
+        try:
+            async with self._write_lock:
+                await ws.send_bytes(data)
+        except (aiohttp.ClientError, ConnectionError, RuntimeError) as err:
+            raise TesyMqttError(f"Tesy MQTT send failed: {err}") from err
+
+    async def _async_read_loop(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        buf = bytearray()
+        try:
+            async for msg in ws:
+                if msg.type != aiohttp.WSMsgType.BINARY:
+                    continue
+                buf.extend(msg.data)
+                for header, body in _split_packets(buf):
+                    self._last_rx = time.monotonic()
+                    self._handle_packet(header, body)
+        except TesyMqttError as err:
+            _LOGGER.debug("Tesy MQTT stream error: %s", err)
+        finally:
+            if self._connack is not None and not self._connack.done():
+                self._connack.set_exception(TesyMqttError("connection closed before CONNACK"))
+            if self._ws is ws:
+                self._ws = None
+                if self._ping_task is not None:
+                    self._ping_task.cancel()
+                    self._ping_task = None
+                if self._subscriptions and not self._closed:
+                    _LOGGER.debug("Tesy MQTT session lost; reconnecting to restore subscriptions")
+                    self._start_reconnect()
+                else:
+                    _LOGGER.debug("Tesy MQTT session lost; will reconnect on next use")
+
+    def _start_reconnect(self) -> None:
+        if self._closed or (self._reconnect_task is not None and not self._reconnect_task.done()):
+            return
+        self._reconnect_task = asyncio.create_task(self._async_reconnect_loop(), name="tesy_mqtt_reconnect")
+
+    async def _async_reconnect_loop(self) -> None:
+        # _async_ensure_connected waits out the backoff delay between attempts.
+        while not self._closed and not self.connected:
+            try:
+                await self._async_ensure_connected()
+            except TesyMqttError as err:
+                _LOGGER.debug("Tesy MQTT reconnect failed: %s", err)
+
+    def _handle_packet(self, header: int, body: bytes) -> None:
+        packet_type = header & 0xF0
+        if packet_type == _CONNACK:
+            if self._connack is not None and not self._connack.done():
+                self._connack.set_result(body[1] if len(body) >= 2 else -1)
+        elif packet_type == _PUBLISH:
+            self._handle_publish(header, body)
+        elif packet_type == _SUBACK:
+            if any(code == 0x80 for code in body[2:]):
+                _LOGGER.warning("Tesy MQTT broker rejected a subscription")
+
+    def _handle_publish(self, header: int, body: bytes) -> None:
+        if len(body) < 2:
+            return
+        topic_len = int.from_bytes(body[:2], "big")
+        topic = body[2 : 2 + topic_len].decode(errors="replace")
+        offset = 2 + topic_len
+        if (header >> 1) & 0x03:
+            offset += 2  # packet identifier; we only subscribe at QoS 0
+        if self._on_message is None:
+            return
+        try:
+            self._on_message(topic, body[offset:])
+        except Exception:  # noqa: BLE001
+            _LOGGER.exception("Error handling Tesy MQTT message on %s", topic)
+
+    async def _async_ping_loop(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        interval = max(self._keepalive / 2, 1)
+        while not ws.closed:
+            await asyncio.sleep(interval)
+            if time.monotonic() - self._last_rx > self._keepalive * 1.5:
+                _LOGGER.debug("Tesy MQTT keepalive expired; closing session")
+                await ws.close()
+                return
+            try:
+                await self._async_send(ws, _packet(_PINGREQ))
+            except TesyMqttError:
+                return
+
+    async def _async_teardown(self) -> None:
+        for task in (self._ping_task, self._reader_task):
+            if task is not None and task is not asyncio.current_task():
+                task.cancel()
+        self._ping_task = None
+        self._reader_task = None
+        ws, self._ws = self._ws, None
+        if ws is not None and not ws.closed:
+            await ws.close()
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from datetime import date, timedelta
 from typing import Any, Callable
 
 from homeassistant.components.sensor import (
@@ -11,8 +12,8 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfEnergy, UnitOfPower, UnitOfTemperature, UnitOfTime
-from homeassistant.core import HomeAssistant
+from homeassistant.const import PERCENTAGE, UnitOfEnergy, UnitOfPower, UnitOfTemperature, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.restore_state import RestoreEntity
@@ -20,61 +21,9 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN
-from .coordinator import TesyCloudCoordinator
-
-
-def _safe_float(v: Any) -> float | None:
-    try:
-        if v is None:
-            return None
-        return float(v)
-    except Exception:
-        return None
-
-
-def _safe_int(v: Any) -> int | None:
-    try:
-        if v is None:
-            return None
-        return int(float(v))
-    except Exception:
-        return None
-
-
-def _state_on(v: Any) -> bool:
-    if isinstance(v, str):
-        return v.lower() == "on"
-    if isinstance(v, bool):
-        return v
-    return False
-
-
-def _payload(coordinator: TesyCloudCoordinator, mac: str) -> dict[str, Any]:
-    return (coordinator.data or {}).get(mac) or {}
-
-
-def _device(coordinator: TesyCloudCoordinator, mac: str) -> dict[str, Any]:
-    dev = _payload(coordinator, mac).get("device") or {}
-    return dev if isinstance(dev, dict) else {}
-
-
-def _state(coordinator: TesyCloudCoordinator, mac: str) -> dict[str, Any]:
-    st = _payload(coordinator, mac).get("state") or {}
-    return st if isinstance(st, dict) else {}
-
-
-def _device_info(coordinator: TesyCloudCoordinator, mac: str) -> dict[str, Any]:
-    dev = _device(coordinator, mac)
-    model = dev.get("model_type") or dev.get("model") or "Cloud Convector"
-    sw = dev.get("firmware_version")
-    name = _payload(coordinator, mac).get("name") or f"Tesy Convector {mac.replace(':','')[-6:]}"
-    return {
-        "identifiers": {(DOMAIN, mac)},
-        "manufacturer": "TESY",
-        "name": name,
-        "model": model,
-        "sw_version": sw,
-    }
+from .coordinator import TesyCloudCoordinator, TesyListenerContext
+from .model import TesyDeviceState
+from .tariff import TesyTariffEngine
 
 
 @dataclass(frozen=True)
@@ -86,7 +35,8 @@ class _SensorDesc:
     state_class: SensorStateClass | None
     unit: str | None
     entity_category: EntityCategory | None
-    value_fn: Callable[[TesyCloudCoordinator, str], Any]
+    keys: tuple[str, ...]  # coordinator keys value_fn reads (see TesyListenerContext)
+    value_fn: Callable[[TesyDeviceState], Any]
 
 
 SENSORS: tuple[_SensorDesc, ...] = (
@@ -98,7 +48,8 @@ SENSORS: tuple[_SensorDesc, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         unit=UnitOfPower.WATT,
         entity_category=None,
-        value_fn=lambda c, m: _safe_float(_state(c, m).get("watt")),
+        keys=("watt",),
+        value_fn=lambda d: d.watt,
     ),
     _SensorDesc(
         key="mode",
@@ -108,7 +59,8 @@ SENSORS: tuple[_SensorDesc, ...] = (
         state_class=None,
         unit=None,
         entity_category=None,
-        value_fn=lambda c, m: _state(c, m).get("mode"),
+        keys=("mode",),
+        value_fn=lambda d: d.mode,
     ),
     _SensorDesc(
         key="program_status",
@@ -118,7 +70,8 @@ SENSORS: tuple[_SensorDesc, ...] = (
         state_class=None,
         unit=None,
         entity_category=None,
-        value_fn=lambda c, m: _state(c, m).get("programStatus"),
+        keys=("programStatus",),
+        value_fn=lambda d: d.program_status,
     ),
     _SensorDesc(
         key="time_remaining",
@@ -128,7 +81,8 @@ SENSORS: tuple[_SensorDesc, ...] = (
         state_class=None,
         unit=UnitOfTime.MINUTES,
         entity_category=None,
-        value_fn=lambda c, m: _safe_int(_state(c, m).get("timeRemaining")),
+        keys=("timeRemaining",),
+        value_fn=lambda d: d.time_remaining,
     ),
     _SensorDesc(
         key="mode_time",
@@ -138,7 +92,8 @@ SENSORS: tuple[_SensorDesc, ...] = (
         state_class=None,
         unit=UnitOfTime.MINUTES,
         entity_category=None,
-        value_fn=lambda c, m: _safe_int(_state(c, m).get("modeTime")),
+        keys=("modeTime",),
+        value_fn=lambda d: d.mode_time,
     ),
     _SensorDesc(
         key="temperature_correction",
@@ -148,7 +103,8 @@ SENSORS: tuple[_SensorDesc, ...] = (
         state_class=None,
         unit=UnitOfTemperature.CELSIUS,
         entity_category=None,
-        value_fn=lambda c, m: _safe_float(_state(c, m).get("TCorrection")),
+        keys=("TCorrection",),
+        value_fn=lambda d: d.temp_correction,
     ),
     _SensorDesc(
         key="comfort_temp",
@@ -158,7 +114,8 @@ SENSORS: tuple[_SensorDesc, ...] = (
         state_class=None,
         unit=UnitOfTemperature.CELSIUS,
         entity_category=None,
-        value_fn=lambda c, m: _safe_float((_state(c, m).get("comfortTemp") or {}).get("temp")),
+        keys=("comfortTemp",),
+        value_fn=lambda d: d.comfort_temp,
     ),
     _SensorDesc(
         key="eco_temp",
@@ -168,7 +125,8 @@ SENSORS: tuple[_SensorDesc, ...] = (
         state_class=None,
         unit=UnitOfTemperature.CELSIUS,
         entity_category=None,
-        value_fn=lambda c, m: _safe_float((_state(c, m).get("ecoTemp") or {}).get("temp")),
+        keys=("ecoTemp",),
+        value_fn=lambda d: d.eco_temp,
     ),
     _SensorDesc(
         key="eco_time",
@@ -178,7 +136,8 @@ SENSORS: tuple[_SensorDesc, ...] = (
         state_class=None,
         unit=UnitOfTime.MINUTES,
         entity_category=None,
-        value_fn=lambda c, m: _safe_int((_state(c, m).get("ecoTemp") or {}).get("time")),
+        keys=("ecoTemp",),
+        value_fn=lambda d: d.eco_time,
     ),
     _SensorDesc(
         key="sleep_time",
@@ -188,7 +147,8 @@ SENSORS: tuple[_SensorDesc, ...] = (
         state_class=None,
         unit=UnitOfTime.MINUTES,
         entity_category=None,
-        value_fn=lambda c, m: _safe_int((_state(c, m).get("sleepMode") or {}).get("time")),
+        keys=("sleepMode",),
+        value_fn=lambda d: d.sleep_time,
     ),
     _SensorDesc(
         key="delayed_start_time",
@@ -198,7 +158,8 @@ SENSORS: tuple[_SensorDesc, ...] = (
         state_class=None,
         unit=UnitOfTime.MINUTES,
         entity_category=None,
-        value_fn=lambda c, m: _safe_int((_state(c, m).get("delayedStart") or {}).get("time")),
+        keys=("delayedStart",),
+        value_fn=lambda d: d.delayed_start_time,
     ),
     _SensorDesc(
         key="delayed_start_temp",
@@ -208,7 +169,8 @@ SENSORS: tuple[_SensorDesc, ...] = (
         state_class=None,
         unit=UnitOfTemperature.CELSIUS,
         entity_category=None,
-        value_fn=lambda c, m: _safe_float((_state(c, m).get("delayedStart") or {}).get("temp")),
+        keys=("delayedStart",),
+        value_fn=lambda d: d.delayed_start_temp,
     ),
     _SensorDesc(
         key="firmware_version",
@@ -218,7 +180,8 @@ SENSORS: tuple[_SensorDesc, ...] = (
         state_class=None,
         unit=None,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda c, m: _device(c, m).get("firmware_version"),
+        keys=("device.firmware_version",),
+        value_fn=lambda d: d.firmware_version,
     ),
     _SensorDesc(
         key="wifi_ssid",
@@ -228,7 +191,8 @@ SENSORS: tuple[_SensorDesc, ...] = (
         state_class=None,
         unit=None,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda c, m: _device(c, m).get("wifi_ssid"),
+        keys=("device.wifi_ssid",),
+        value_fn=lambda d: d.wifi_ssid,
     ),
     _SensorDesc(
         key="reported_ip",
@@ -238,7 +202,8 @@ SENSORS: tuple[_SensorDesc, ...] = (
         state_class=None,
         unit=None,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda c, m: _device(c, m).get("ip"),
+        keys=("device.ip",),
+        value_fn=lambda d: d.ip,
     ),
     _SensorDesc(
         key="timezone",
@@ -248,11 +213,45 @@ SENSORS: tuple[_SensorDesc, ...] = (
         state_class=None,
         unit=None,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda c, m: _device(c, m).get("timezone"),
+        keys=("device.timezone",),
+        value_fn=lambda d: d.timezone,
     ),
 )
 
 
+# stat -> (name, unique_id suffix, icon)
+TEMPERATURE_STATS = {
+    "min": ("Temperature Min (24h)", "temp_min_24h", "mdi:thermometer-low"),
+    "max": ("Temperature Max (24h)", "temp_max_24h", "mdi:thermometer-high"),
+    "mean": ("Temperature Mean (24h)", "temp_mean_24h", "mdi:thermometer"),
+    "trend": ("Temperature Trend", "temp_trend", "mdi:chart-line"),
+}
+TEMPERATURE_STATS_WINDOW = 24 * 3600  # seconds
+TEMPERATURE_TREND_WINDOW = 3600  # seconds
+
+# metric -> (name, unique_id suffix, icon, unit)
+HEATING_METRICS = {
+    "duty_cycle": ("Heating Duty Cycle (24h)", "heating_duty_cycle_24h", "mdi:percent", PERCENTAGE),
+    "cycles": ("Heating Cycles (24h)", "heating_cycles_24h", "mdi:sync", None),
+    "median_on_minutes": ("Heating Median Cycle (24h)", "heating_median_cycle_24h", "mdi:timer-outline", UnitOfTime.MINUTES),
+    "short_cycles": ("Heating Short Cycles (24h)", "heating_short_cycles_24h", "mdi:alert-cycle", None),
+}
+
+# kind -> (name, unique_id suffix, icon, unit)
+THERMAL_SENSORS = {
+    "heat_up_rate": ("Heat-up Rate", "heat_up_rate", "mdi:thermometer-chevron-up", "°C/h"),
+    "cool_down_rate": ("Cool-down Rate", "cool_down_rate", "mdi:thermometer-chevron-down", "°C/h"),
+    "minutes_to_target": ("Time to Target", "minutes_to_target", "mdi:timer-sand", UnitOfTime.MINUTES),
+}
+
+# period -> (name, unique_id suffix)
+COST_PERIODS = {
+    "today": ("Heating Cost Today", "heating_cost_today"),
+    "month": ("Heating Cost This Month", "heating_cost_month"),
+    "30d": ("Heating Cost (last 30 days)", "heating_cost_30d"),
+}
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
     coordinator: TesyCloudCoordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
     macs = list((coordinator.data or {}).keys())
@@ -264,17 +263,29 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
         entities.append(TesyCloudEstimatedEnergySensor(coordinator, mac))
         entities.append(TesyCloudHistoryHoursSensor(coordinator, mac, kind="status"))
         entities.append(TesyCloudHistoryHoursSensor(coordinator, mac, kind="heating"))
+        for stat in TEMPERATURE_STATS:
+            entities.append(TesyCloudTemperatureStatSensor(coordinator, mac, stat))
+        for metric in HEATING_METRICS:
+            entities.append(TesyCloudHeatingAnalyticsSensor(coordinator, mac, metric))
+        for kind in THERMAL_SENSORS:
+            entities.append(TesyCloudThermalSensor(coordinator, mac, kind))
+
+    tariff: TesyTariffEngine | None = hass.data[DOMAIN][entry.entry_id].get("tariff")
+    if tariff is not None:
+        for period in COST_PERIODS:
+            entities.extend(TesyCloudHeatingCostSensor(coordinator, tariff, mac, period) for mac in macs)
+            entities.append(TesyCloudHeatingCostSensor(coordinator, tariff, None, period, entry.entry_id))
 
     async_add_entities(entities)
 
 
 class TesyCloudBasicSensor(CoordinatorEntity[TesyCloudCoordinator], SensorEntity):
     def __init__(self, coordinator: TesyCloudCoordinator, mac: str, desc: _SensorDesc) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, TesyListenerContext(mac, frozenset(desc.keys)))
         self._mac = mac
         self._desc = desc
 
-        base_name = _payload(coordinator, mac).get("name") or f"Tesy Convector {mac.replace(':','')[-6:]}"
+        base_name = coordinator.devices[mac].name
         self._attr_name = f"{base_name} {desc.name}"
         self._attr_unique_id = f"{mac}_{desc.key}"
         self._attr_icon = desc.icon
@@ -285,11 +296,13 @@ class TesyCloudBasicSensor(CoordinatorEntity[TesyCloudCoordinator], SensorEntity
 
     @property
     def native_value(self):
-        return self._desc.value_fn(self.coordinator, self._mac)
+        dev = self.coordinator.devices.get(self._mac)
+        return self._desc.value_fn(dev) if dev is not None else None
 
     @property
     def device_info(self):
-        return _device_info(self.coordinator, self._mac)
+        dev = self.coordinator.devices.get(self._mac)
+        return dev.device_info if dev is not None else None
 
 
 class TesyCloudEstimatedEnergySensor(CoordinatorEntity[TesyCloudCoordinator], SensorEntity, RestoreEntity):
@@ -300,47 +313,39 @@ class TesyCloudEstimatedEnergySensor(CoordinatorEntity[TesyCloudCoordinator], Se
     _attr_icon = "mdi:counter"
 
     def __init__(self, coordinator: TesyCloudCoordinator, mac: str) -> None:
-        super().__init__(coordinator)
+        # Energy keeps accumulating between state changes, so it updates on every refresh.
+        super().__init__(coordinator, TesyListenerContext(mac, every_refresh=True))
         self._mac = mac
-        base_name = _payload(coordinator, mac).get("name") or f"Tesy Convector {mac.replace(':','')[-6:]}"
+        base_name = coordinator.devices[mac].name
         self._attr_name = f"{base_name} Energy (estimated)"
         self._attr_unique_id = f"{mac}_energy_estimated"
-        self._energy_kwh: float = 0.0
-        self._last_ts = dt_util.utcnow()
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
+        engine = self.coordinator.energy
+        if engine is None or engine.has_stored(self._mac):
+            return
+        # Totals used to live only in this sensor's state; carry them over once.
         last = await self.async_get_last_state()
         if last and last.state not in (None, "unknown", "unavailable"):
             try:
-                self._energy_kwh = float(last.state)
-            except Exception:
-                self._energy_kwh = 0.0
-        self._last_ts = dt_util.utcnow()
+                engine.seed(self._mac, float(last.state))
+            except ValueError:
+                pass
 
     def _effective_power_w(self) -> float:
-        st = _state(self.coordinator, self._mac)
-        heating = _state_on(st.get("heating"))
-        if not heating:
-            return 0.0
-        w = _safe_float(st.get("watt"))
-        return float(w) if w is not None else 0.0
+        dev = self.coordinator.devices.get(self._mac)
+        return dev.effective_power_w if dev is not None else 0.0
 
     @property
     def native_value(self) -> float:
-        now = dt_util.utcnow()
-        dt_seconds = (now - self._last_ts).total_seconds()
-        if dt_seconds < 0:
-            dt_seconds = 0
-        dt_seconds = min(dt_seconds, 6 * 3600)  # cap long jumps
-        p_w = self._effective_power_w()
-        self._energy_kwh += (p_w / 1000.0) * (dt_seconds / 3600.0)
-        self._last_ts = now
-        return round(self._energy_kwh, 4)
+        engine = self.coordinator.energy
+        return engine.total_kwh(self._mac) if engine is not None else 0.0
 
     @property
     def device_info(self):
-        return _device_info(self.coordinator, self._mac)
+        dev = self.coordinator.devices.get(self._mac)
+        return dev.device_info if dev is not None else None
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -350,16 +355,21 @@ class TesyCloudEstimatedEnergySensor(CoordinatorEntity[TesyCloudCoordinator], Se
         }
 
 
+# Smallest change in a rolling on-time total (hours) worth a state write.
+_HISTORY_MIN_DELTA_H = 0.01
+
+
 class TesyCloudHistoryHoursSensor(CoordinatorEntity[TesyCloudCoordinator], SensorEntity):
     """Rolling 30-day time-on sensor, persisted by integration history storage."""
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = UnitOfTime.HOURS
 
     def __init__(self, coordinator: TesyCloudCoordinator, mac: str, kind: str) -> None:
-        super().__init__(coordinator)
+        # On-time grows while the device is on, so it updates on every refresh.
+        super().__init__(coordinator, TesyListenerContext(mac, every_refresh=True))
         self._mac = mac
         self._kind = kind  # "status" or "heating"
-        base_name = _payload(coordinator, mac).get("name") or f"Tesy Convector {mac.replace(':','')[-6:]}"
+        base_name = coordinator.devices[mac].name
         if kind == "status":
             self._attr_name = f"{base_name} Power On Time (last 30 days)"
             self._attr_unique_id = f"{mac}_power_on_time_30d"
@@ -368,16 +378,189 @@ class TesyCloudHistoryHoursSensor(CoordinatorEntity[TesyCloudCoordinator], Senso
             self._attr_name = f"{base_name} Heating Time (last 30 days)"
             self._attr_unique_id = f"{mac}_heating_time_30d"
             self._attr_icon = "mdi:radiator"
+        self._attr_native_value = self._hours()
+        self._written_available: bool | None = None
 
-    @property
-    def native_value(self) -> float:
+    def _hours(self) -> float:
         hist = getattr(self.coordinator, "_history", None)
         if hist is None:
             return 0.0
-        if self._kind == "status":
-            return hist.get_hours_last_days(self._mac, "status", days=30)
-        return hist.get_hours_last_days(self._mac, "heating", days=30)
+        return hist.get_hours_last_days(self._mac, self._kind, days=30)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        # The running total is O(1) to read, but only meaningful changes are written.
+        value = self._hours()
+        available = self.available
+        if (
+            available == self._written_available
+            and self._attr_native_value is not None
+            and abs(value - self._attr_native_value) < _HISTORY_MIN_DELTA_H
+        ):
+            return
+        self._attr_native_value = value
+        self._written_available = available
+        self.async_write_ha_state()
 
     @property
     def device_info(self):
-        return _device_info(self.coordinator, self._mac)
+        dev = self.coordinator.devices.get(self._mac)
+        return dev.device_info if dev is not None else None
+
+
+class TesyCloudTemperatureStatSensor(CoordinatorEntity[TesyCloudCoordinator], SensorEntity):
+    """Min/max/mean over the last 24 h, or the last hour's trend, from the coordinator's ring buffers."""
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator: TesyCloudCoordinator, mac: str, stat: str) -> None:
+        # Every refresh adds a sample, so the statistics move on every refresh.
+        super().__init__(coordinator, TesyListenerContext(mac, every_refresh=True))
+        self._mac = mac
+        self._stat = stat
+        name, suffix, icon = TEMPERATURE_STATS[stat]
+        base_name = coordinator.devices[mac].name
+        self._attr_name = f"{base_name} {name}"
+        self._attr_unique_id = f"{mac}_{suffix}"
+        self._attr_icon = icon
+        if stat == "trend":
+            self._attr_native_unit_of_measurement = "°C/h"
+        else:
+            self._attr_device_class = SensorDeviceClass.TEMPERATURE
+            self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+
+    @property
+    def native_value(self) -> float | None:
+        now = dt_util.utcnow().timestamp()
+        temperatures = self.coordinator.temperatures
+        if self._stat == "trend":
+            slope = temperatures.trend(self._mac, now - TEMPERATURE_TREND_WINDOW)
+            return round(slope, 2) if slope is not None else None
+        stats = temperatures.stats(self._mac, now - TEMPERATURE_STATS_WINDOW)
+        return round(stats[self._stat], 2) if stats is not None else None
+
+    @property
+    def device_info(self):
+        dev = self.coordinator.devices.get(self._mac)
+        return dev.device_info if dev is not None else None
+
+
+class TesyCloudHeatingAnalyticsSensor(CoordinatorEntity[TesyCloudCoordinator], SensorEntity):
+    """Duty-cycle metric of the last 24 h, computed from the heating history."""
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator: TesyCloudCoordinator, mac: str, metric: str) -> None:
+        # The window slides with time, so the metrics update on every refresh.
+        super().__init__(coordinator, TesyListenerContext(mac, every_refresh=True))
+        self._mac = mac
+        self._metric = metric
+        name, suffix, icon, unit = HEATING_METRICS[metric]
+        base_name = coordinator.devices[mac].name
+        self._attr_name = f"{base_name} {name}"
+        self._attr_unique_id = f"{mac}_{suffix}"
+        self._attr_icon = icon
+        self._attr_native_unit_of_measurement = unit
+
+    @property
+    def native_value(self) -> float | None:
+        summary = self.coordinator.heating_summary(self._mac)
+        return summary[self._metric] if summary is not None else None
+
+    @property
+    def device_info(self):
+        dev = self.coordinator.devices.get(self._mac)
+        return dev.device_info if dev is not None else None
+
+
+class TesyCloudThermalSensor(CoordinatorEntity[TesyCloudCoordinator], SensorEntity):
+    """Prediction from the device's online thermal model; unknown until enough samples were fitted."""
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator: TesyCloudCoordinator, mac: str, kind: str) -> None:
+        # The model is updated on every refresh.
+        super().__init__(coordinator, TesyListenerContext(mac, every_refresh=True))
+        self._mac = mac
+        self._kind = kind
+        name, suffix, icon, unit = THERMAL_SENSORS[kind]
+        base_name = coordinator.devices[mac].name
+        self._attr_name = f"{base_name} {name}"
+        self._attr_unique_id = f"{mac}_{suffix}"
+        self._attr_icon = icon
+        self._attr_native_unit_of_measurement = unit
+
+    @property
+    def native_value(self) -> float | None:
+        thermal = self.coordinator.thermal
+        dev = self.coordinator.devices.get(self._mac)
+        if thermal is None or dev is None:
+            return None
+        if self._kind == "heat_up_rate":
+            value = thermal.heat_up_rate(dev)
+        elif self._kind == "cool_down_rate":
+            value = thermal.cool_down_rate(dev)
+        else:
+            value = thermal.minutes_to_target(dev)
+            return round(value) if value is not None else None
+        return round(value, 2) if value is not None else None
+
+    @property
+    def device_info(self):
+        dev = self.coordinator.devices.get(self._mac)
+        return dev.device_info if dev is not None else None
+
+
+def _period_start(period: str) -> date:
+    today = dt_util.now().date()
+    if period == "today":
+        return today
+    if period == "month":
+        return today.replace(day=1)
+    return today - timedelta(days=29)
+
+
+class TesyCloudHeatingCostSensor(CoordinatorEntity[TesyCloudCoordinator], SensorEntity):
+    """Time-of-use heating cost of one device, or of all devices when ``mac`` is None."""
+    _attr_device_class = SensorDeviceClass.MONETARY
+    _attr_icon = "mdi:cash"
+
+    def __init__(
+        self,
+        coordinator: TesyCloudCoordinator,
+        tariff: TesyTariffEngine,
+        mac: str | None,
+        period: str,
+        entry_id: str | None = None,
+    ) -> None:
+        if mac is None:
+            # Fleet total: follows every device, so no per-device context.
+            super().__init__(coordinator)
+        else:
+            # The open heating interval keeps adding cost, so it updates on every refresh.
+            super().__init__(coordinator, TesyListenerContext(mac, every_refresh=True))
+        self._tariff = tariff
+        self._mac = mac
+        self._period = period
+        name, suffix = COST_PERIODS[period]
+        if mac is None:
+            self._attr_name = f"MyTESY {name}"
+            self._attr_unique_id = f"{entry_id}_{suffix}"
+        else:
+            self._attr_name = f"{coordinator.devices[mac].name} {name}"
+            self._attr_unique_id = f"{mac}_{suffix}"
+
+    @property
+    def native_unit_of_measurement(self) -> str | None:
+        return self.hass.config.currency if self.hass is not None else None
+
+    @property
+    def native_value(self) -> float:
+        first_day = _period_start(self._period)
+        now = dt_util.utcnow().timestamp()
+        macs = [self._mac] if self._mac is not None else list(self.coordinator.devices)
+        return round(sum(self._tariff.cost(mac, first_day, now) for mac in macs), 2)
+
+    @property
+    def device_info(self):
+        if self._mac is None:
+            return None
+        dev = self.coordinator.devices.get(self._mac)
+        return dev.device_info if dev is not None else None
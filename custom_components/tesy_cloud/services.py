@@ -0,0 +1,256 @@
+"""Integration-level services for MyTESY cloud convectors."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components.climate import ATTR_HVAC_MODE, ATTR_PRESET_MODE, HVACMode
+from homeassistant.const import ATTR_TEMPERATURE
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+from homeassistant.helpers.service import async_extract_referenced_entity_ids
+from homeassistant.util import dt as dt_util
+
+from .analytics import fleet_summary, hourly_duty_cycle
+from .api import TesyCloudError, state_commands
+from .climate import PRESET_MODES
+from .const import DOMAIN, DEFAULT_BULK_CONCURRENCY
+from .coordinator import TesyCloudCoordinator
+from .temperature import RESOLUTIONS
+
+SERVICE_BULK_COMMAND = "bulk_command"
+SERVICE_QUERY_HISTORY = "query_history"
+SERVICE_GET_TEMPERATURE_HISTORY = "get_temperature_history"
+SERVICE_HEATING_ANALYTICS = "heating_analytics"
+
+ATTR_MAX_CONCURRENCY = "max_concurrency"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_KIND = "kind"
+ATTR_RESOLUTION = "resolution"
+ATTR_HOURS = "hours"
+
+BULK_COMMAND_SCHEMA = vol.All(
+    cv.make_entity_service_schema(
+        {
+            vol.Optional(ATTR_HVAC_MODE): vol.In([HVACMode.OFF, HVACMode.HEAT]),
+            vol.Optional(ATTR_PRESET_MODE): vol.In(PRESET_MODES),
+            vol.Optional(ATTR_TEMPERATURE): vol.Coerce(float),
+            vol.Optional(ATTR_MAX_CONCURRENCY, default=DEFAULT_BULK_CONCURRENCY): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=64)
+            ),
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_HVAC_MODE, ATTR_PRESET_MODE, ATTR_TEMPERATURE),
+)
+
+QUERY_HISTORY_SCHEMA = cv.make_entity_service_schema(
+    {
+        vol.Required(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_KIND, default="heating"): vol.In(["heating", "status"]),
+    }
+)
+
+GET_TEMPERATURE_HISTORY_SCHEMA = cv.make_entity_service_schema(
+    {
+        vol.Optional(ATTR_RESOLUTION, default="15min"): vol.In(list(RESOLUTIONS)),
+    }
+)
+
+HEATING_ANALYTICS_SCHEMA = cv.make_entity_service_schema(
+    {
+        vol.Optional(ATTR_HOURS, default=24): vol.All(vol.Coerce(int), vol.Range(min=1, max=30 * 24)),
+    }
+)
+
+
+def _resolve_targets(hass: HomeAssistant, call: ServiceCall) -> dict[str, tuple[TesyCloudCoordinator, str]]:
+    """Map the call's targets to {entity_id: (coordinator, mac)} via our climate entities."""
+    selected = async_extract_referenced_entity_ids(hass, call)
+    entity_ids = selected.referenced | selected.indirectly_referenced
+    registry = er.async_get(hass)
+    entries = hass.data.get(DOMAIN, {})
+
+    targets: dict[str, tuple[TesyCloudCoordinator, str]] = {}
+    for entity_id in entity_ids:
+        reg = registry.async_get(entity_id)
+        if reg is None or reg.platform != DOMAIN or reg.domain != "climate":
+            continue
+        data = entries.get(reg.config_entry_id)
+        if data is None:
+            continue
+        targets[entity_id] = (data["coordinator"], reg.unique_id)
+    return targets
+
+
+async def _async_bulk_command(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    hvac_mode = call.data.get(ATTR_HVAC_MODE)
+    commands = state_commands(
+        power=None if hvac_mode is None else hvac_mode == HVACMode.HEAT,
+        mode=call.data.get(ATTR_PRESET_MODE),
+        temperature=call.data.get(ATTR_TEMPERATURE),
+    )
+    targets = _resolve_targets(hass, call)
+    if not targets:
+        raise HomeAssistantError("No MyTESY climate entities matched the service target")
+
+    semaphore = asyncio.Semaphore(call.data[ATTR_MAX_CONCURRENCY])
+
+    async def _async_run(coordinator: TesyCloudCoordinator, mac: str) -> dict[str, Any]:
+        dev = coordinator.devices.get(mac)
+        device = dev.raw_device if dev is not None else {}
+        async with semaphore:
+            try:
+                acks = await coordinator.api.async_send_commands(device, commands)
+            except TesyCloudError as err:
+                return {"success": False, "error": str(err)}
+        coordinator.async_note_command()
+        results = await asyncio.gather(*acks, return_exceptions=True)
+        unconfirmed = [command for (command, _body), res in zip(commands, results) if isinstance(res, Exception)]
+        if unconfirmed:
+            return {"success": True, "confirmed": False, "unconfirmed": unconfirmed}
+        return {"success": True, "confirmed": True}
+
+    outcomes = await asyncio.gather(*(_async_run(coordinator, mac) for coordinator, mac in targets.values()))
+
+    for coordinator in {coordinator for coordinator, _mac in targets.values()}:
+        await coordinator.async_request_refresh()
+
+    return {
+        "results": {
+            entity_id: {"mac": mac, **outcome}
+            for (entity_id, (_coordinator, mac)), outcome in zip(targets.items(), outcomes)
+        }
+    }
+
+
+def _query_history(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    start = dt_util.as_utc(call.data[ATTR_START])
+    end = dt_util.as_utc(call.data[ATTR_END]) if ATTR_END in call.data else dt_util.utcnow()
+    if end <= start:
+        raise HomeAssistantError("end must be after start")
+    targets = _resolve_targets(hass, call)
+    if not targets:
+        raise HomeAssistantError("No MyTESY climate entities matched the service target")
+
+    kind = call.data[ATTR_KIND]
+    results: dict[str, Any] = {}
+    for entity_id, (coordinator, mac) in targets.items():
+        hist = getattr(coordinator, "_history", None)
+        result = hist.query(mac, kind, start, end) if hist is not None else None
+        results[entity_id] = {"mac": mac, **(result or {"on_seconds": 0.0, "on_hours": 0.0, "transitions": 0})}
+    return {"start": start.isoformat(), "end": end.isoformat(), "kind": kind, "results": results}
+
+
+def _get_temperature_history(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    targets = _resolve_targets(hass, call)
+    if not targets:
+        raise HomeAssistantError("No MyTESY climate entities matched the service target")
+
+    resolution = call.data[ATTR_RESOLUTION]
+    return {
+        "resolution": resolution,
+        "results": {
+            entity_id: {"mac": mac, "samples": coordinator.temperatures.export(mac, resolution)}
+            for entity_id, (coordinator, mac) in targets.items()
+        },
+    }
+
+
+def _heating_analytics(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    targets = _resolve_targets(hass, call)
+    if not targets:
+        raise HomeAssistantError("No MyTESY climate entities matched the service target")
+
+    hours = call.data[ATTR_HOURS]
+    now = dt_util.utcnow()
+    end = now.timestamp()
+    start = end - hours * 3600
+    first_hour = now.replace(minute=0, second=0, microsecond=0) - timedelta(hours=hours - 1)
+
+    # Devices are summarised per history manager (config entry) in one pass each.
+    by_entry: dict[int, tuple[Any, dict[str, str]]] = {}
+    for entity_id, (coordinator, mac) in targets.items():
+        hist = getattr(coordinator, "_history", None)
+        if hist is not None:
+            by_entry.setdefault(id(hist), (hist, {}))[1][mac] = entity_id
+
+    results: dict[str, Any] = {}
+    fleet = {"device_count": 0, "on_hours": 0.0, "cycles": 0, "short_cycling": []}
+    duties: list[float] = []
+    for hist, entities in by_entry.values():
+        summary = fleet_summary(hist, entities, start, end)
+        for mac, device in summary["devices"].items():
+            results[entities[mac]] = {
+                "mac": mac,
+                **device,
+                "hourly": hourly_duty_cycle(hist, mac, first_hour, hours),
+            }
+            duties.append(device["duty_cycle"])
+        fleet["device_count"] += summary["fleet"]["device_count"]
+        fleet["on_hours"] = round(fleet["on_hours"] + summary["fleet"]["on_hours"], 3)
+        fleet["cycles"] += summary["fleet"]["cycles"]
+        fleet["short_cycling"] += [entities[mac] for mac in summary["fleet"]["short_cycling"]]
+    fleet["mean_duty_cycle"] = round(sum(duties) / len(duties), 1) if duties else None
+    return {"hours": hours, "fleet": fleet, "results": results}
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    if hass.services.has_service(DOMAIN, SERVICE_BULK_COMMAND):
+        return
+
+    async def _handle_bulk_command(call: ServiceCall) -> ServiceResponse:
+        return await _async_bulk_command(hass, call)
+
+    async def _handle_query_history(call: ServiceCall) -> ServiceResponse:
+        return _query_history(hass, call)
+
+    async def _handle_get_temperature_history(call: ServiceCall) -> ServiceResponse:
+        return _get_temperature_history(hass, call)
+
+    async def _handle_heating_analytics(call: ServiceCall) -> ServiceResponse:
+        return _heating_analytics(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BULK_COMMAND,
+        _handle_bulk_command,
+        schema=BULK_COMMAND_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY_HISTORY,
+        _handle_query_history,
+        schema=QUERY_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_TEMPERATURE_HISTORY,
+        _handle_get_temperature_history,
+        schema=GET_TEMPERATURE_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_HEATING_ANALYTICS,
+        _handle_heating_analytics,
+        schema=HEATING_ANALYTICS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+def async_unload_services(hass: HomeAssistant) -> None:
+    if hass.data.get(DOMAIN):
+        return  # other entries still loaded
+    hass.services.async_remove(DOMAIN, SERVICE_BULK_COMMAND)
+    hass.services.async_remove(DOMAIN, SERVICE_QUERY_HISTORY)
+    hass.services.async_remove(DOMAIN, SERVICE_GET_TEMPERATURE_HISTORY)
+    hass.services.async_remove(DOMAIN, SERVICE_HEATING_ANALYTICS)
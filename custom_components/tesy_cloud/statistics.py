@@ -0,0 +1,143 @@
+"""Hourly long-term statistics for MyTESY devices, imported from the integration history.
+
+Rather than letting the recorder compile statistics from thousands of per-poll
+sensor states, every device gets two external statistics built from the
+TesyHistoryManager heating track: ``tesy:<mac>_heating_hours`` and
+``tesy:<mac>_energy`` (heating time charged at the power reported while it
+heated, as rolled up by the history). Each run
+continues after the last hour already imported, so hours missed while Home
+Assistant was down are backfilled on the next start.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics, get_last_statistics
+from homeassistant.const import UnitOfEnergy, UnitOfTime
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_utc_time_change
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .coordinator import TesyCloudCoordinator
+from .history import HOURLY_KEEP_DAYS, TesyHistoryManager
+from .model import TesyDeviceState
+
+_LOGGER = logging.getLogger(__name__)
+
+IMPORT_BATCH_HOURS = 7 * 24  # hours per async_add_external_statistics call
+
+
+def statistic_id(mac: str, kind: str) -> str:
+    return f"{DOMAIN}:{mac.replace(':', '').lower()}_{kind}"
+
+
+def _as_utc(value: Any) -> datetime | None:
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, timezone.utc)
+    if isinstance(value, datetime):
+        return dt_util.as_utc(value)
+    return None
+
+
+class TesyStatisticsImporter:
+    """Imports complete hours of heating time and estimated energy as external statistics."""
+
+    def __init__(self, hass: HomeAssistant, coordinator: TesyCloudCoordinator, history: TesyHistoryManager) -> None:
+        self.hass = hass
+        self.coordinator = coordinator
+        self.history = history
+        self._lock = asyncio.Lock()
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Import now, then a few minutes after every hour."""
+        if self._unsub is None:
+            self._unsub = async_track_utc_time_change(self.hass, self._scheduled_import, minute=5, second=0)
+        self.hass.async_create_task(self.async_import())
+
+    @callback
+    def async_stop(self) -> None:
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _scheduled_import(self, _now: datetime) -> None:
+        self.hass.async_create_task(self.async_import())
+
+    async def async_import(self) -> None:
+        if "recorder" not in self.hass.config.components:
+            return
+        async with self._lock:
+            for mac, dev in list(self.coordinator.devices.items()):
+                try:
+                    await self._async_import_device(mac, dev)
+                except Exception:  # noqa: BLE001
+                    _LOGGER.exception("Importing statistics for %s failed", mac)
+
+    async def _async_last(self, stat_id: str) -> tuple[datetime | None, float]:
+        last = await get_instance(self.hass).async_add_executor_job(
+            get_last_statistics, self.hass, 1, stat_id, True, {"sum"}
+        )
+        rows = last.get(stat_id) or []
+        if not rows:
+            return None, 0.0
+        return _as_utc(rows[0].get("start")), float(rows[0].get("sum") or 0.0)
+
+    async def _async_import_device(self, mac: str, dev: TesyDeviceState) -> None:
+        end = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)  # last complete hour ends here
+        oldest = end - timedelta(days=HOURLY_KEEP_DAYS)
+        watt = dev.watt or 0.0  # only for hours stored before the history tracked energy
+
+        def heating_hours(start: datetime, count: int) -> list[float]:
+            return [seconds / 3600.0 for seconds in self.history.hourly_on_seconds(mac, "heating", start, count)]
+
+        def energy(start: datetime, count: int) -> list[float]:
+            return self.history.hourly_energy_kwh(mac, start, count, watt)
+
+        series = (
+            ("heating_hours", f"{dev.name} Heating Time", UnitOfTime.HOURS, heating_hours),
+            ("energy", f"{dev.name} Energy (estimated)", UnitOfEnergy.KILO_WATT_HOUR, energy),
+        )
+        for kind, name, unit, hourly in series:
+            stat_id = statistic_id(mac, kind)
+            last_start, total = await self._async_last(stat_id)
+            if last_start is not None:
+                start = last_start + timedelta(hours=1)
+            else:
+                start = self.history.first_hour(mac, "heating")
+                if start is None:
+                    continue
+            start = max(start, oldest)
+            hours = int((end - start).total_seconds() // 3600)
+            if hours <= 0:
+                continue
+
+            metadata = StatisticMetaData(
+                has_mean=False,
+                has_sum=True,
+                name=name,
+                source=DOMAIN,
+                statistic_id=stat_id,
+                unit_of_measurement=unit,
+            )
+            for offset in range(0, hours, IMPORT_BATCH_HOURS):
+                batch_start = start + timedelta(hours=offset)
+                count = min(IMPORT_BATCH_HOURS, hours - offset)
+                rows: list[StatisticData] = []
+                for i, value in enumerate(hourly(batch_start, count)):
+                    total += value
+                    # A running total: state and sum are both the cumulative value.
+                    rows.append(
+                        StatisticData(start=batch_start + timedelta(hours=i), state=round(total, 6), sum=round(total, 6))
+                    )
+                async_add_external_statistics(self.hass, metadata, rows)
+            _LOGGER.debug("Imported %s hours of %s", hours, stat_id)
@@ -0,0 +1,177 @@
+"""Time-of-use heating cost from the heating intervals and a weekly tariff.
+
+The weekly schedule is compiled into sorted boundaries (seconds since Monday
+00:00 local time) with one price per segment; every local midnight is a
+boundary too. The cost of an interval is a sweep over the boundaries it
+crosses: one step per tariff or day change, never per minute. Each interval
+is charged at the mean power the history recorded for it, like the energy
+sensor and statistics; the device's current power is only a fallback for
+intervals stored before power was tracked. The sweep
+advances in UTC and converts each boundary from local wall-clock time, so on
+DST days a band that is skipped or repeated is charged for the time that
+actually elapsed. Closed heating
+intervals are costed once, when TesyHistoryManager reports them, into
+per-device daily totals; only the open interval is costed on read.
+
+Schedule syntax, one rule per line or separated by ``;`` (later rules win):
+
+    mon-fri 07:00-23:00 0.28
+    sat,sun 00:00-24:00 0.18
+    * 23:00-07:00 0.12
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from collections.abc import Callable, Iterable, Iterator
+from datetime import date, datetime, time, timedelta, timezone
+
+from homeassistant.util import dt as dt_util
+
+from .history import TesyHistoryManager
+
+DAY = 86400
+WEEK = 7 * DAY
+KEEP_DAYS = 40  # daily totals kept; enough for this month and the last 30 days
+
+_DAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+_RULE = re.compile(r"^(\S+)\s+(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})\s+(\d+(?:\.\d+)?)$")
+
+
+class TariffScheduleError(ValueError):
+    """The tariff schedule text could not be parsed."""
+
+
+def _parse_days(text: str) -> list[int]:
+    if text in ("*", "all", "daily"):
+        return list(range(7))
+    days: list[int] = []
+    for part in text.split(","):
+        first, _, last = part.partition("-")
+        if first not in _DAYS or (last and last not in _DAYS):
+            raise TariffScheduleError(f"unknown day in {text!r}")
+        start = _DAYS.index(first)
+        end = _DAYS.index(last) if last else start
+        days.extend((start + i) % 7 for i in range((end - start) % 7 + 1))
+    return days
+
+
+def parse_schedule(text: str, default_price: float) -> TesyTariffSchedule:
+    """Compile ``text`` into a weekly schedule; raises TariffScheduleError."""
+    rules: list[tuple[float, float, float]] = []  # (week start, week end, price), in priority order
+    for raw in re.split(r"[;\n]", text or ""):
+        line = raw.strip().lower()
+        if not line:
+            continue
+        match = _RULE.match(line)
+        if match is None:
+            raise TariffScheduleError(f"cannot parse rule {raw.strip()!r}")
+        days, h1, m1, h2, m2, price = match.groups()
+        start = int(h1) * 3600 + int(m1) * 60
+        end = int(h2) * 3600 + int(m2) * 60
+        if int(m1) > 59 or int(m2) > 59 or start > DAY or end > DAY:
+            raise TariffScheduleError(f"invalid time in {raw.strip()!r}")
+        for day in _parse_days(days):
+            base = day * DAY
+            if start < end:
+                rules.append((base + start, base + end, float(price)))
+            elif start > end:  # wraps past midnight into the next day
+                rules.append((base + start, base + DAY, float(price)))
+                next_day = (day + 1) % 7 * DAY
+                rules.append((next_day, next_day + end, float(price)))
+    return TesyTariffSchedule(rules, default_price)
+
+
+class TesyTariffSchedule:
+    """Piecewise-constant weekly price (per kWh)."""
+
+    __slots__ = ("boundaries", "prices")
+
+    def __init__(self, rules: list[tuple[float, float, float]], default_price: float) -> None:
+        points = {float(day * DAY) for day in range(8)}
+        for start, end, _price in rules:
+            points.update((start, end))
+        self.boundaries = sorted(points)
+        self.prices: list[float] = []
+        for start, end in zip(self.boundaries, self.boundaries[1:]):
+            price = default_price
+            for rule_start, rule_end, rule_price in rules:
+                if rule_start <= start and end <= rule_end:
+                    price = rule_price
+            self.prices.append(price)
+
+    def costs(self, start: float, end: float, watt: float) -> Iterator[tuple[int, float]]:
+        """Yield (local day ordinal, cost) for heating at ``watt`` over [start, end)."""
+        t = start
+        while t < end:
+            local = dt_util.as_local(datetime.fromtimestamp(t, timezone.utc))
+            monday = datetime.combine(local.date() - timedelta(days=local.weekday()), time())
+            pos = (local.replace(tzinfo=None) - monday).total_seconds()
+            idx = bisect_right(self.boundaries, pos) - 1
+            step = min(end, _next_utc(monday + timedelta(seconds=self.boundaries[idx + 1]), t)) - t
+            yield local.date().toordinal(), self.prices[idx] * watt * step / 3_600_000.0
+            t += step
+
+
+def _next_utc(wall: datetime, after: float) -> float:
+    """First UTC timestamp after ``after`` at which local wall-clock time is ``wall``.
+
+    A wall time repeated when clocks go back maps to the occurrence still
+    ahead; one skipped when they go forward maps to the end of the gap.
+    """
+    for fold in (0, 1):
+        ts = wall.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE, fold=fold).timestamp()
+        if ts > after:
+            return ts
+    return ts
+
+
+class TesyTariffEngine:
+    """Per-device daily heating cost, updated as heating intervals close."""
+
+    def __init__(
+        self,
+        schedule: TesyTariffSchedule,
+        history: TesyHistoryManager,
+        watt_lookup: Callable[[str], float | None],
+    ) -> None:
+        """``watt_lookup(mac)`` is the current power, used where no power was recorded."""
+        self.schedule = schedule
+        self.history = history
+        self._watt = watt_lookup
+        self._days: dict[str, dict[int, float]] = {}
+
+    def rebuild(self, macs: Iterable[str], now: float) -> None:
+        """Cost the stored heating intervals of the last KEEP_DAYS days; the open one is costed on read."""
+        self._days = {}
+        for mac in macs:
+            for start, end, watt in self.history.powered_intervals(mac, "heating", now - KEEP_DAYS * DAY, now):
+                self._add(mac, start, end, watt)
+
+    def add_interval(self, mac: str, key: str, start: float, end: float, watt: float | None) -> None:
+        """TesyHistoryManager interval listener."""
+        if key == "heating":
+            self._add(mac, start, end, watt)
+
+    def _add(self, mac: str, start: float, end: float, watt: float | None) -> None:
+        if watt is None:
+            watt = self._watt(mac)
+        if not watt or end <= start:
+            return
+        days = self._days.setdefault(mac, {})
+        for day, cost in self.schedule.costs(start, end, watt):
+            days[day] = days.get(day, 0.0) + cost
+        oldest = dt_util.now().date().toordinal() - KEEP_DAYS
+        for day in [day for day in days if day < oldest]:
+            del days[day]
+
+    def cost(self, mac: str, first_day: date, now: float) -> float:
+        """Heating cost of ``mac`` from the start of local ``first_day`` until ``now``."""
+        first = first_day.toordinal()
+        total = sum(cost for day, cost in self._days.get(mac, {}).items() if day >= first)
+        since = self.history.open_since(mac, "heating")
+        watt = self.history.open_power(mac, "heating", now) or self._watt(mac)
+        if since is not None and watt:
+            total += sum(cost for day, cost in self.schedule.costs(since, now, watt) if day >= first)
+        return total
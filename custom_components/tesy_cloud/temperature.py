@@ -0,0 +1,202 @@
+"""Bounded in-memory temperature history per device.
+
+Every sample of (current temperature, setpoint) is folded into a chain of
+fixed-size ring buffers: 1-minute buckets for a day, 15-minute buckets for a
+week and hourly buckets for 30 days. When a bucket closes its aggregate is
+written to its ring and passed on to the next, coarser tier, so memory is
+bounded by TEMPERATURE_TIERS no matter how often devices report. Rings grow
+with the buckets actually closed, so a device seen for an hour holds an
+hour of buckets rather than a month's worth of empty slots.
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+from datetime import datetime, timezone
+from typing import Any
+
+from .const import TEMPERATURE_TIERS
+from .model import TesyDeviceState
+
+RESOLUTIONS = {"1min": 0, "15min": 1, "hourly": 2}
+
+_NAN = float("nan")
+
+
+class _Tier:
+    """Ring of closed buckets (start, mean, min, max, setpoint) plus the bucket being filled."""
+
+    __slots__ = (
+        "step",
+        "capacity",
+        "starts",
+        "means",
+        "lows",
+        "highs",
+        "setpoints",
+        "head",
+        "size",
+        "bucket",
+        "total",
+        "count",
+        "low",
+        "high",
+        "setpoint",
+    )
+
+    def __init__(self, step: int, capacity: int) -> None:
+        self.step = step
+        self.capacity = capacity
+        # Grown up to ``capacity`` as buckets close, then overwritten from ``head``.
+        self.starts = array("d")
+        self.means = array("d")
+        self.lows = array("d")
+        self.highs = array("d")
+        self.setpoints = array("d")
+        self.head = 0  # next slot to write
+        self.size = 0
+        self.bucket: float | None = None
+        self.total = 0.0
+        self.count = 0
+        self.low = math.inf
+        self.high = -math.inf
+        self.setpoint = _NAN
+
+    def add(
+        self, ts: float, total: float, count: int, low: float, high: float, setpoint: float
+    ) -> tuple[float, float, int, float, float, float] | None:
+        """Fold an aggregate into the open bucket; returns the bucket it closed, if any."""
+        bucket = ts // self.step * self.step
+        if self.bucket is not None and bucket < self.bucket:
+            return None  # late sample for a bucket that is already closed
+        closed = None
+        if self.bucket is not None and bucket != self.bucket:
+            closed = self._close()
+        if self.bucket is None:
+            self.bucket = bucket
+        self.total += total
+        self.count += count
+        self.low = min(self.low, low)
+        self.high = max(self.high, high)
+        self.setpoint = setpoint
+        return closed
+
+    def _close(self) -> tuple[float, float, int, float, float, float]:
+        closed = (self.bucket, self.total, self.count, self.low, self.high, self.setpoint)
+        slot = self.head
+        if self.size < self.capacity:
+            # Still filling: ``head`` is the end of the arrays.
+            self.starts.append(self.bucket)
+            self.means.append(self.total / self.count)
+            self.lows.append(self.low)
+            self.highs.append(self.high)
+            self.setpoints.append(self.setpoint)
+        else:
+            self.starts[slot] = self.bucket
+            self.means[slot] = self.total / self.count
+            self.lows[slot] = self.low
+            self.highs[slot] = self.high
+            self.setpoints[slot] = self.setpoint
+        self.head = (slot + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        self.bucket = None
+        self.total = 0.0
+        self.count = 0
+        self.low = math.inf
+        self.high = -math.inf
+        self.setpoint = _NAN
+        return closed
+
+    def rows(self, since: float = -math.inf) -> list[tuple[float, float, float, float, float]]:
+        """Buckets starting at or after ``since``, oldest first, including the open one."""
+        out = []
+        first = (self.head - self.size) % self.capacity
+        for i in range(self.size):
+            slot = (first + i) % self.capacity
+            if self.starts[slot] >= since:
+                out.append((self.starts[slot], self.means[slot], self.lows[slot], self.highs[slot], self.setpoints[slot]))
+        if self.bucket is not None and self.count and self.bucket >= since:
+            out.append((self.bucket, self.total / self.count, self.low, self.high, self.setpoint))
+        return out
+
+
+class _DeviceBuffer:
+    __slots__ = ("tiers",)
+
+    def __init__(self) -> None:
+        self.tiers = [_Tier(step, capacity) for step, capacity in TEMPERATURE_TIERS]
+
+    def add(self, ts: float, temp: float, setpoint: float) -> None:
+        sample: tuple[float, float, int, float, float, float] | None = (ts, temp, 1, temp, temp, setpoint)
+        for tier in self.tiers:
+            if sample is None:
+                break
+            sample = tier.add(*sample)
+
+
+class TesyTemperatureHistory:
+    """Per-MAC temperature ring buffers with min/max/mean/trend over recent samples."""
+
+    def __init__(self) -> None:
+        self._buffers: dict[str, _DeviceBuffer] = {}
+
+    def add(self, dev: TesyDeviceState, ts: float) -> None:
+        if dev.current_temp is None:
+            return
+        buffer = self._buffers.get(dev.mac)
+        if buffer is None:
+            buffer = self._buffers[dev.mac] = _DeviceBuffer()
+        setpoint = dev.target_temp if dev.target_temp is not None else _NAN
+        buffer.add(ts, dev.current_temp, setpoint)
+
+    def add_all(self, devices: dict[str, TesyDeviceState], ts: float) -> None:
+        for dev in devices.values():
+            self.add(dev, ts)
+
+    def stats(self, mac: str, since: float) -> dict[str, float] | None:
+        """Min, max and mean temperature since ``since``, from the 15-minute tier."""
+        buffer = self._buffers.get(mac)
+        if buffer is None:
+            return None
+        rows = buffer.tiers[RESOLUTIONS["15min"]].rows(since)
+        if not rows:
+            return None
+        return {
+            "min": min(row[2] for row in rows),
+            "max": max(row[3] for row in rows),
+            "mean": sum(row[1] for row in rows) / len(rows),
+        }
+
+    def trend(self, mac: str, since: float) -> float | None:
+        """Least-squares slope of the 1-minute means since ``since``, in °C per hour."""
+        buffer = self._buffers.get(mac)
+        if buffer is None:
+            return None
+        rows = buffer.tiers[RESOLUTIONS["1min"]].rows(since)
+        if len(rows) < 3:
+            return None
+        t0 = rows[0][0]
+        xs = [(row[0] - t0) / 3600.0 for row in rows]
+        ys = [row[1] for row in rows]
+        mean_x = sum(xs) / len(xs)
+        mean_y = sum(ys) / len(ys)
+        var = sum((x - mean_x) ** 2 for x in xs)
+        if var == 0:
+            return None
+        return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var
+
+    def export(self, mac: str, resolution: str) -> list[dict[str, Any]]:
+        buffer = self._buffers.get(mac)
+        if buffer is None:
+            return []
+        return [
+            {
+                "start": datetime.fromtimestamp(start, timezone.utc).isoformat(),
+                "mean": round(mean, 2),
+                "min": low,
+                "max": high,
+                "setpoint": None if math.isnan(setpoint) else setpoint,
+            }
+            for start, mean, low, high, setpoint in buffer.tiers[RESOLUTIONS[resolution]].rows()
+        ]
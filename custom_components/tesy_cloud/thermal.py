@@ -0,0 +1,169 @@
+"""Online per-device thermal model for heat-up/cool-down rates and time to target.
+
+Each room is modelled as
+
+    dT/dt = k_heat * u * P + c + k_loss * T        (°C per hour)
+
+with ``u`` the share of time spent heating, ``P`` the selected power in kW,
+and ``c + k_loss * T`` Newton cooling towards an unknown ambient temperature.
+The three coefficients are fitted by recursive least squares with a
+forgetting factor: every sample pair costs one fixed-size 3x3 update, and the
+full history is never refitted. Coefficients and covariance are persisted by
+TesyHistoryManager.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable
+from typing import Any
+
+from .model import TesyDeviceState
+
+FORGETTING = 0.995  # ~200 samples of memory
+INITIAL_COVARIANCE = 1000.0
+MIN_SAMPLE_SECONDS = 300  # temperature resolution needs a few minutes to show a slope
+MAX_SAMPLE_SECONDS = 3600  # longer gaps restart the sample
+MIN_UPDATES = 12  # fits with fewer updates are not reported
+
+
+class _RoomModel:
+    __slots__ = ("theta", "cov", "updates", "anchor_ts", "anchor_temp", "last_ts", "heating_kw", "heat_kwh")
+
+    def __init__(self) -> None:
+        self.theta = [0.0, 0.0, 0.0]  # k_heat, c, k_loss
+        self.cov = [[INITIAL_COVARIANCE if i == j else 0.0 for j in range(3)] for i in range(3)]
+        self.updates = 0
+        self.anchor_ts: float | None = None  # start of the sample being accumulated
+        self.anchor_temp = 0.0
+        self.last_ts = 0.0
+        self.heating_kw = 0.0  # power in effect since last_ts
+        self.heat_kwh = 0.0  # heating energy since the anchor
+
+    def to_json(self) -> dict[str, Any]:
+        return {"theta": self.theta[:], "cov": [row[:] for row in self.cov], "updates": self.updates}
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> _RoomModel:
+        model = cls()
+        theta, cov = data.get("theta"), data.get("cov")
+        if isinstance(theta, list) and len(theta) == 3 and isinstance(cov, list) and len(cov) == 3:
+            model.theta = [float(v) for v in theta]
+            model.cov = [[float(v) for v in row] for row in cov]
+            model.updates = int(data.get("updates") or 0)
+        return model
+
+    def add(self, ts: float, temp: float, heating_kw: float) -> None:
+        if self.anchor_ts is None or ts - self.last_ts > MAX_SAMPLE_SECONDS or ts < self.last_ts:
+            self._restart(ts, temp, heating_kw)
+            return
+        # Left Riemann: the power reported last time applied until now.
+        self.heat_kwh += self.heating_kw * (ts - self.last_ts) / 3600.0
+        self.last_ts = ts
+        self.heating_kw = heating_kw
+        elapsed_h = (ts - self.anchor_ts) / 3600.0
+        if elapsed_h * 3600.0 < MIN_SAMPLE_SECONDS:
+            return
+        # Regress the mean slope over the sample on the mean heating power and start temperature.
+        self._update([self.heat_kwh / elapsed_h, 1.0, self.anchor_temp], (temp - self.anchor_temp) / elapsed_h)
+        self._restart(ts, temp, heating_kw)
+
+    def _restart(self, ts: float, temp: float, heating_kw: float) -> None:
+        self.anchor_ts = self.last_ts = ts
+        self.anchor_temp = temp
+        self.heating_kw = heating_kw
+        self.heat_kwh = 0.0
+
+    def _update(self, x: list[float], y: float) -> None:
+        p = self.cov
+        px = [sum(p[i][j] * x[j] for j in range(3)) for i in range(3)]
+        denom = FORGETTING + sum(x[i] * px[i] for i in range(3))
+        if denom <= 0:
+            return
+        gain = [v / denom for v in px]
+        error = y - sum(self.theta[i] * x[i] for i in range(3))
+        self.theta = [self.theta[i] + gain[i] * error for i in range(3)]
+        self.cov = [[(p[i][j] - gain[i] * px[j]) / FORGETTING for j in range(3)] for i in range(3)]
+        self.updates += 1
+
+    def rate(self, temp: float, heating_kw: float) -> float:
+        k_heat, c, k_loss = self.theta
+        return k_heat * heating_kw + c + k_loss * temp
+
+
+class TesyThermalModel:
+    """Room models keyed by MAC, fed from coordinator refreshes."""
+
+    def __init__(self) -> None:
+        self._rooms: dict[str, _RoomModel] = {}
+        self.dirty: set[str] = set()  # MACs whose coefficients changed since the last checkpoint
+
+    def load_json(self, data: Any) -> None:
+        self._rooms = {}
+        self.merge_json(data)
+
+    def merge_json(self, data: Any) -> None:
+        """Apply stored rooms (a snapshot or a checkpoint of some MACs) over the current ones."""
+        if isinstance(data, dict):
+            for mac, room in data.items():
+                if isinstance(room, dict):
+                    self._rooms[mac] = _RoomModel.from_json(room)
+        self.dirty = set()
+
+    def to_json(self, macs: Iterable[str] | None = None) -> dict[str, Any]:
+        """Coefficients of ``macs`` (all rooms if None)."""
+        rooms = self._rooms if macs is None else {mac: self._rooms[mac] for mac in macs if mac in self._rooms}
+        return {mac: room.to_json() for mac, room in rooms.items()}
+
+    def update(self, dev: TesyDeviceState, ts: float) -> None:
+        if dev.current_temp is None:
+            return
+        room = self._rooms.get(dev.mac)
+        if room is None:
+            room = self._rooms[dev.mac] = _RoomModel()
+        updates = room.updates
+        room.add(ts, dev.current_temp, dev.effective_power_w / 1000.0)
+        if room.updates != updates:
+            self.dirty.add(dev.mac)
+
+    def update_all(self, devices: dict[str, TesyDeviceState], ts: float) -> None:
+        for dev in devices.values():
+            self.update(dev, ts)
+
+    def _fitted(self, mac: str) -> _RoomModel | None:
+        room = self._rooms.get(mac)
+        return room if room is not None and room.updates >= MIN_UPDATES else None
+
+    def heat_up_rate(self, dev: TesyDeviceState) -> float | None:
+        """°C per hour while heating at the selected power, at the current temperature."""
+        room = self._fitted(dev.mac)
+        if room is None or dev.current_temp is None or not dev.watt:
+            return None
+        return room.rate(dev.current_temp, dev.watt / 1000.0)
+
+    def cool_down_rate(self, dev: TesyDeviceState) -> float | None:
+        """°C per hour lost while not heating, at the current temperature (positive when cooling)."""
+        room = self._fitted(dev.mac)
+        if room is None or dev.current_temp is None:
+            return None
+        return -room.rate(dev.current_temp, 0.0)
+
+    def minutes_to_target(self, dev: TesyDeviceState) -> float | None:
+        """Predicted heating time from the current temperature to the setpoint; None if unreachable."""
+        room = self._fitted(dev.mac)
+        temp, target = dev.current_temp, dev.target_temp
+        if room is None or temp is None or target is None or not dev.watt:
+            return None
+        if temp >= target:
+            return 0.0
+        k_heat, c, k_loss = room.theta
+        drive = k_heat * dev.watt / 1000.0 + c
+        if abs(k_loss) < 1e-6:
+            return 60.0 * (target - temp) / drive if drive > 0 else None
+        if k_loss > 0:
+            return None  # not a physical fit (yet)
+        # T(t) = T_eq + (T0 - T_eq) * exp(k_loss * t) approaches T_eq = -drive / k_loss.
+        equilibrium = -drive / k_loss
+        if equilibrium <= target:
+            return None
+        return 60.0 * math.log((target - equilibrium) / (temp - equilibrium)) / k_loss
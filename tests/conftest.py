@@ -0,0 +1,23 @@
+"""Shared fixtures."""
+
+import asyncio
+
+import pytest
+
+
+@pytest.fixture
+def run_with_hass(tmp_path):
+    """Run ``test(hass)`` inside a bare, running HomeAssistant instance."""
+    core = pytest.importorskip("homeassistant.core")
+
+    def run(test):
+        async def main():
+            hass = core.HomeAssistant(str(tmp_path))
+            try:
+                return await test(hass)
+            finally:
+                await hass.async_stop(force=True)
+
+        return asyncio.run(main())
+
+    return run
@@ -0,0 +1,61 @@
+"""Tests for the heating duty-cycle analytics."""
+
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.tesy_cloud import history as history_module  # noqa: E402
+from custom_components.tesy_cloud.analytics import heating_summary  # noqa: E402
+from custom_components.tesy_cloud.history import TesyHistoryManager  # noqa: E402
+
+MAC = "AA:BB"
+T0 = 1_700_000_000.0
+
+
+@pytest.fixture
+def history(monkeypatch):
+    monkeypatch.setattr(history_module, "_utcnow", lambda: datetime.fromtimestamp(T0 + 10_000, timezone.utc))
+    return TesyHistoryManager(MagicMock(), "test")
+
+
+def _heat(history, *intervals):
+    track = history._ensure(MAC)["heating"]
+    for start, end in intervals:
+        track.apply(True, T0 + start)
+        if end is not None:
+            track.apply(False, T0 + end)
+
+
+def test_clipped_and_open_intervals_are_not_cycles(history):
+    # Cut by the window start, one full cycle, still running at the window end.
+    _heat(history, (-3000, 60), (1000, 1600), (9900, None))
+
+    summary = heating_summary(history, MAC, T0, T0 + 10_000)
+
+    assert summary["cycles"] == 1
+    assert summary["short_cycles"] == 0
+    assert summary["median_on_minutes"] == 10.0
+    assert summary["on_hours"] == round((60 + 600 + 100) / 3600, 3)
+
+
+def test_cycles_on_the_window_edges_count(history):
+    _heat(history, (0, 100), (200, 300), (9900, 10_000))
+
+    summary = heating_summary(history, MAC, T0, T0 + 10_000)
+
+    assert summary["cycles"] == 3
+    assert summary["short_cycles"] == 3
+
+
+def test_cycle_crossing_the_window_end_is_not_counted(history):
+    _heat(history, (9900, 10_050))
+
+    summary = heating_summary(history, MAC, T0, T0 + 10_000)
+
+    assert summary["cycles"] == 0
+    assert summary["short_cycles"] == 0
+    assert summary["mean_on_minutes"] is None
+    assert summary["duty_cycle"] == 1.0
@@ -0,0 +1,105 @@
+"""Tests for command coalescing and acknowledgement handling in the cloud API."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.tesy_cloud.api import TesyCloudApi, TesyCloudError  # noqa: E402
+from custom_components.tesy_cloud.mqtt import TesyMqttError  # noqa: E402
+
+DEVICE = {"mac": "AA", "model": "M1", "token": "tok"}
+RESPONSE = "v1/AA/response/M1/tok/setTemp"
+
+
+def _api(coalesce_window: float = 0.05) -> TesyCloudApi:
+    api = TesyCloudApi(MagicMock(), "user", "pass", "1", "app", coalesce_window=coalesce_window)
+    api._mqtt = MagicMock(async_subscribe=AsyncMock(), async_publish=AsyncMock(), async_close=AsyncMock())
+    api._async_post_app_log = AsyncMock()
+    return api
+
+
+def _published(api: TesyCloudApi) -> list[tuple[str, dict]]:
+    return [(call.args[0].rsplit("/", 1)[1], json.loads(call.args[1])) for call in api._mqtt.async_publish.await_args_list]
+
+
+def test_coalesced_commands_publish_the_last_value_once():
+    async def test():
+        api = _api()
+
+        first, second, third = await asyncio.gather(
+            api.async_set_temperature(DEVICE, 50),
+            api.async_set_temperature(DEVICE, 55),
+            api.async_set_temperature(DEVICE, 60),
+        )
+
+        assert _published(api) == [("setTemp", {"app_id": "app", "temp": 60})]
+        assert first is second is third
+        assert api.coalesced_commands == 2
+        api._handle_mqtt_message(RESPONSE, b'{"payload": {"temp": 60}}')
+        assert (await first) == {"payload": {"temp": 60}}
+        assert not api.has_pending_commands
+
+    asyncio.run(test())
+
+
+def test_cancelled_caller_does_not_cancel_the_publish():
+    async def test():
+        api = _api()
+        impatient = asyncio.create_task(api.async_set_temperature(DEVICE, 50))
+        await asyncio.sleep(0)
+        patient = asyncio.create_task(api.async_set_temperature(DEVICE, 55))
+        await asyncio.sleep(0)
+
+        impatient.cancel()
+        ack = await patient
+
+        assert impatient.cancelled()
+        assert _published(api) == [("setTemp", {"app_id": "app", "temp": 55})]
+        api._handle_mqtt_message(RESPONSE, b"{}")
+        assert (await ack) == {}
+
+    asyncio.run(test())
+
+
+def test_unanswered_command_times_out_and_is_forgotten():
+    async def test():
+        api = _api(coalesce_window=0)
+
+        ack = await api.async_send_command(DEVICE, "setTemp", {"temp": 55}, ack_timeout=0.02)
+        assert api.has_pending_commands
+
+        with pytest.raises(TesyCloudError, match="No response from AA to setTemp"):
+            await ack
+        assert api._pending_acks == {}
+        assert not api.has_pending_commands
+
+    asyncio.run(test())
+
+
+def test_failed_or_abandoned_publishes_leave_no_pending_acks():
+    async def test():
+        api = _api(coalesce_window=0)
+
+        api._mqtt.async_publish.side_effect = TesyMqttError("down")
+        with pytest.raises(TesyCloudError, match="down"):
+            await api.async_set_power(DEVICE, True)
+        await asyncio.sleep(0)  # done callbacks run on the next loop iteration
+        assert api._pending_acks == {}
+
+        api._mqtt.async_publish.side_effect = None
+        acks = [await api.async_set_power(DEVICE, True) for _ in range(3)]
+        assert len(api._pending_acks[("AA", "onOff")]) == 3
+        acks[0].cancel()
+        await asyncio.sleep(0)
+        assert len(api._pending_acks[("AA", "onOff")]) == 2
+
+        api._handle_mqtt_message("v1/AA/response/M1/tok/onOff", b'{"payload": {"status": "on"}}')
+        assert all(ack.result()["payload"] == {"status": "on"} for ack in acks[1:])
+        await asyncio.sleep(0)
+        assert api._pending_acks == {}
+
+    asyncio.run(test())
@@ -0,0 +1,22 @@
+"""Tests for the options flow."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.tesy_cloud.config_flow import TesyCloudConfigFlow  # noqa: E402
+from custom_components.tesy_cloud.const import CONF_PUSH_UPDATES  # noqa: E402
+
+
+def test_options_flow_reads_the_entry_it_was_created_for():
+    entry = MagicMock(options={CONF_PUSH_UPDATES: True})
+    flow = TesyCloudConfigFlow.async_get_options_flow(entry)
+    flow.async_show_form = lambda **kwargs: kwargs
+
+    result = asyncio.run(flow.async_step_init())
+
+    defaults = {str(key): key.default() for key in result["data_schema"].schema}
+    assert defaults[CONF_PUSH_UPDATES] is True
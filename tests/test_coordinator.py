@@ -0,0 +1,150 @@
+"""Tests for the coordinator's adaptive polling, snapshot diffing and listener wakeups."""
+
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.tesy_cloud import coordinator as coordinator_module  # noqa: E402
+from custom_components.tesy_cloud.const import (  # noqa: E402
+    POLL_FAST_INTERVAL,
+    POLL_IDLE_AFTER,
+    POLL_IDLE_INTERVAL,
+)
+from custom_components.tesy_cloud.coordinator import TesyCloudCoordinator  # noqa: E402
+from custom_components.tesy_cloud.history import TesyHistoryManager  # noqa: E402
+
+BASE = timedelta(seconds=30)
+
+
+def _raw(status="on", temp=20, current_temp=19.5, heating="on"):
+    return {
+        "AA": {"mac": "AA", "model": "cn06", "token": "t", "state": {"status": status, "temp": temp,
+               "current_temp": current_temp, "heating": heating}},
+        "BB": {"mac": "BB", "model": "cn06", "token": "t", "state": {"status": "on", "temp": 21,
+               "current_temp": 20.0, "heating": "off"}},
+    }
+
+
+def _coordinator(hass, raw):
+    api = MagicMock(has_pending_commands=False)
+    api.async_get_my_devices = AsyncMock(return_value=raw)
+    return TesyCloudCoordinator(hass, api, BASE), api
+
+
+def test_unchanged_device_keeps_its_state_object(run_with_hass):
+    async def test(hass):
+        coordinator, api = _coordinator(hass, _raw())
+        await coordinator.async_refresh()
+        before = coordinator.data
+
+        api.async_get_my_devices.return_value = _raw(current_temp=19.0)
+        await coordinator.async_refresh()
+
+        assert coordinator.data["BB"] is before["BB"]
+        assert coordinator.data["AA"] is not before["AA"]
+        assert coordinator.changed_keys == {"AA": frozenset({"current_temp"})}
+
+    run_with_hass(test)
+
+
+def test_thermostat_cycling_does_not_poll_fast(run_with_hass, monkeypatch):
+    async def test(hass):
+        coordinator, api = _coordinator(hass, _raw())
+        await coordinator.async_refresh()
+
+        api.async_get_my_devices.return_value = _raw(heating="off", current_temp=20.5)
+        await coordinator.async_refresh()
+        assert coordinator.update_interval == BASE
+
+        api.async_get_my_devices.return_value = _raw(temp=23)
+        await coordinator.async_refresh()
+        assert coordinator.update_interval.total_seconds() == POLL_FAST_INTERVAL
+
+    run_with_hass(test)
+
+
+def test_idle_when_all_off_or_nothing_was_set(run_with_hass, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(coordinator_module.time, "monotonic", lambda: clock[0])
+
+    async def test(hass):
+        coordinator, api = _coordinator(hass, _raw())
+        await coordinator.async_refresh()
+        assert coordinator.update_interval == BASE
+
+        # Temperature drift alone does not count as activity.
+        clock[0] += POLL_IDLE_AFTER
+        api.async_get_my_devices.return_value = _raw(current_temp=18.0)
+        await coordinator.async_refresh()
+        assert coordinator.update_interval.total_seconds() == POLL_IDLE_INTERVAL
+
+        api.has_pending_commands = True
+        await coordinator.async_refresh()
+        assert coordinator.update_interval.total_seconds() == POLL_FAST_INTERVAL
+
+    run_with_hass(test)
+
+
+def test_single_device_merge_wakes_only_that_device(run_with_hass):
+    async def test(hass):
+        coordinator, _api = _coordinator(hass, _raw())
+        await coordinator.async_refresh()
+        woken = []
+        for mac in ("AA", "BB"):
+            for context in (
+                coordinator_module.TesyListenerContext(mac, frozenset({"temp"})),
+                coordinator_module.TesyListenerContext(mac, every_refresh=True),
+            ):
+                coordinator.async_add_listener(lambda context=context: woken.append(context), context)
+
+        coordinator.async_merge_state("AA", {"temp": 25})
+        assert {(c.mac, c.every_refresh) for c in woken} == {("AA", False), ("AA", True)}
+
+        woken.clear()
+        coordinator.async_merge_state("AA", {"heating": "off"})
+        assert {(c.mac, c.every_refresh) for c in woken} == {("AA", True)}
+
+        woken.clear()
+        await coordinator.async_refresh()
+        assert {(c.mac, c.every_refresh) for c in woken} == {("AA", True), ("BB", True), ("AA", False)}
+
+    run_with_hass(test)
+
+
+def test_pushed_transition_invalidates_the_heating_summary(run_with_hass):
+    async def test(hass):
+        history = TesyHistoryManager(hass, "test")
+        api = MagicMock(has_pending_commands=False)
+        api.async_get_my_devices = AsyncMock(return_value=_raw())
+        coordinator = TesyCloudCoordinator(hass, api, BASE, history=history)
+        await coordinator.async_refresh()
+        before = coordinator.heating_summary("AA")
+        other = coordinator.heating_summary("BB")
+
+        coordinator.async_merge_message("AA", {"payload": {"heating": "off"}})
+        await hass.async_block_till_done()
+
+        after = coordinator.heating_summary("AA")
+        assert after is not before
+        assert after["cycles"] == before["cycles"] + 1
+        assert coordinator.heating_summary("BB") is other
+        await history.async_close()
+
+    run_with_hass(test)
+
+
+def test_pushed_state_feeds_the_thermal_model(run_with_hass):
+    async def test(hass):
+        coordinator, _api = _coordinator(hass, _raw())
+        await coordinator.async_refresh()
+        coordinator.thermal = MagicMock()
+
+        coordinator.async_merge_message("AA", {"payload": {"current_temp": 18.0}})
+
+        (dev, _ts), _kwargs = coordinator.thermal.update.call_args
+        assert (dev.mac, dev.current_temp) == ("AA", 18.0)
+
+    run_with_hass(test)
@@ -0,0 +1,26 @@
+"""Tests for the estimated energy engine."""
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.tesy_cloud.energy import TesyEnergyEngine  # noqa: E402
+
+
+def test_checkpoint_carries_only_changed_devices():
+    engine = TesyEnergyEngine()
+    engine.load_json({"AA": 1.5, "BB": 2.0})
+    engine.seed("CC", 0.25)
+
+    assert engine.dirty == {"CC"}
+    assert engine.to_json(engine.dirty) == {"CC": 0.25}
+
+
+def test_partial_checkpoint_merges_over_snapshot():
+    engine = TesyEnergyEngine()
+    engine.load_json({"AA": 1.5, "BB": 2.0})
+    engine.merge_json({"BB": 3.0})
+
+    assert engine.to_json() == {"AA": 1.5, "BB": 3.0}
+    assert engine.has_stored("AA") and engine.has_stored("BB")
+    assert not engine.dirty
@@ -0,0 +1,166 @@
+"""Tests for the heating history energy rollup."""
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.tesy_cloud import history as history_module  # noqa: E402
+from custom_components.tesy_cloud.history import TesyHistoryManager  # noqa: E402
+
+MAC = "AA:BB"
+HOUR0 = 1_700_000_000 // 3600 * 3600.0
+
+
+@pytest.fixture
+def history(monkeypatch):
+    monkeypatch.setattr(history_module, "_utcnow", lambda: datetime.fromtimestamp(HOUR0 + 5 * 3600, timezone.utc))
+    return TesyHistoryManager(MagicMock(), "test")
+
+
+def _start():
+    return datetime.fromtimestamp(HOUR0, timezone.utc)
+
+
+def test_energy_uses_the_power_reported_while_heating(history):
+    track = history._ensure(MAC)["heating"]
+    track.apply(True, HOUR0, 1000.0)
+    track.set_power(2000.0, HOUR0 + 1800)
+    track.apply(False, HOUR0 + 3600)
+    track.apply(True, HOUR0 + 3600 + 1800, 500.0)
+
+    # Today's power does not matter for hours that recorded their own.
+    kwh = history.hourly_energy_kwh(MAC, _start(), 3, fallback_watt=9999.0)
+
+    assert kwh == pytest.approx([1.5, 0.25, 0.5])
+
+
+def test_energy_survives_a_snapshot_round_trip(history):
+    track = history._ensure(MAC)["heating"]
+    track.apply(True, HOUR0, 1000.0)
+    track.apply(False, HOUR0 + 1800)
+    track.apply(True, HOUR0 + 3600, 2000.0)
+
+    restored = history_module._Track.from_json(track.to_json())
+    history._data[MAC]["heating"] = restored
+
+    assert history.hourly_energy_kwh(MAC, _start(), 2, 0.0) == pytest.approx([0.5, 2.0])
+    assert history.powered_intervals(MAC, "heating", HOUR0, HOUR0 + 7200) == [(HOUR0, HOUR0 + 1800, 1000.0)]
+    assert history.open_power(MAC, "heating", HOUR0 + 7200) == pytest.approx(2000.0)
+
+
+def test_hours_without_recorded_energy_fall_back_to_the_given_power(history):
+    track = history._ensure(MAC)["heating"]
+    track.hourly.buckets[int(HOUR0 // 3600)] = [1800.0, 2.0]  # stored before energy was tracked
+
+    assert history.hourly_energy_kwh(MAC, _start(), 1, fallback_watt=2000.0) == pytest.approx([1.0])
+
+
+def test_compaction_is_skipped_while_stopping(history):
+    history.hass.is_stopping = True
+    history._save = MagicMock(side_effect=AssertionError("snapshot written while stopping"))
+
+    asyncio.run(history._async_compact())
+
+
+def test_snapshot_does_not_share_rollup_buckets(history):
+    track = history._ensure(MAC)["heating"]
+    track.apply(True, HOUR0, 1000.0)
+    track.apply(False, HOUR0 + 60)
+
+    stored = track.to_json()["hourly"]
+    track.apply(True, HOUR0 + 120, 1000.0)
+    track.apply(False, HOUR0 + 180)
+
+    assert stored[str(int(HOUR0 // 3600))][0] == 60.0
+
+
+def _on_seconds(intervals, start, end):
+    return sum(max(0.0, min(e, end) - max(s, start)) for s, e in intervals)
+
+
+def test_window_and_range_queries_across_a_prune(history):
+    track = history._ensure(MAC)["status"]
+    intervals = [(HOUR0 + h * 3600 + 600, HOUR0 + h * 3600 + 2400) for h in range(10)]
+    for s, e in intervals:
+        track.apply(True, s)
+        track.apply(False, e)
+    now = HOUR0 + 10 * 3600
+    # One window reaches back past the prune cutoff, one does not.
+    assert track.window_seconds(8 * 3600, now) == pytest.approx(_on_seconds(intervals, now - 8 * 3600, now))
+    assert track.window_seconds(3 * 3600, now) == pytest.approx(_on_seconds(intervals, now - 3 * 3600, now))
+
+    assert track.prune(HOUR0 + 4 * 3600) == 4
+    kept = intervals[4:]
+
+    now += 1800
+    track.apply(True, now - 900)
+    kept_open = kept + [(now - 900, now)]
+    for span in (8 * 3600, 3 * 3600, 1800):
+        assert track.window_seconds(span, now) == pytest.approx(_on_seconds(kept_open, now - span, now))
+    start = HOUR0 + 4 * 3600 + 1200
+    on, transitions = track.between(start, now, now)
+    assert on == pytest.approx(_on_seconds(kept_open, start, now))
+    assert transitions == 2 * 6 - 1 + 1  # the first kept interval starts before ``start``
+
+
+def test_journal_replays_on_top_of_the_snapshot(run_with_hass, monkeypatch):
+    monkeypatch.setattr(history_module, "_utcnow", lambda: datetime.fromtimestamp(HOUR0 + 5 * 3600, timezone.utc))
+
+    def snapshot(offset, heating, watt):
+        state = {"status": "on", "heating": heating, "watt": watt, "updated_at": history_module._iso_epoch(HOUR0 + offset)}
+        return {MAC: {"state": state}}
+
+    async def test(hass):
+        first = TesyHistoryManager(hass, "test")
+        await first.async_load()
+        await first.process_snapshot(snapshot(0, "on", 1000))
+        await first.process_snapshot(snapshot(1800, "off", 0))
+        await first._async_compact()
+        # Only in the journal from here on.
+        await first.process_snapshot(snapshot(3600, "on", 2000))
+        await first.process_snapshot(snapshot(5400, "off", 0))
+        await first.process_snapshot(snapshot(7200, "on", 500))
+        await first.async_close()
+
+        second = TesyHistoryManager(hass, "test")
+        await second.async_load()
+        await second.async_close()
+        return first, second
+
+    first, second = run_with_hass(test)
+
+    assert second._seq == first._seq
+    assert second.powered_intervals(MAC, "heating", HOUR0, HOUR0 + 4 * 3600) == [
+        (HOUR0, HOUR0 + 1800, 1000.0),
+        (HOUR0 + 3600, HOUR0 + 5400, 2000.0),
+    ]
+    assert second.open_power(MAC, "heating", HOUR0 + 4 * 3600) == pytest.approx(500.0)
+    assert second.hourly_energy_kwh(MAC, _start(), 3, 0.0) == pytest.approx([0.5, 1.0, 0.5])
+    assert second.query(MAC, "status", _start(), datetime.fromtimestamp(HOUR0 + 4 * 3600, timezone.utc)) == first.query(
+        MAC, "status", _start(), datetime.fromtimestamp(HOUR0 + 4 * 3600, timezone.utc)
+    )
+
+
+def test_rolling_window_tracks_intervals_sliding_out(history):
+    track = history._ensure(MAC)["status"]
+    intervals = [(HOUR0 + i * 1000, HOUR0 + i * 1000 + 400) for i in range(20)]
+    for s, e in intervals:
+        track.apply(True, s)
+        track.apply(False, e)
+    span = 3000.0
+
+    now = intervals[-1][1]
+    track.window_seconds(span, now)
+    window = track.windows[span]
+    while now < intervals[-1][1] + span + 500:
+        expected = _on_seconds(intervals, now - span, now)
+        assert track.window_seconds(span, now) == pytest.approx(expected)
+        assert track.windows[span] is window  # updated in place, not rebuilt
+        now += 170  # lands mid-interval as often as between intervals
+
+    assert window.head == len(intervals)
+    assert window.closed == pytest.approx(0.0)
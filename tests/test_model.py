@@ -0,0 +1,24 @@
+"""Tests for the MyTESY payload projection."""
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.tesy_cloud.api import TesyCloudApi  # noqa: E402
+from custom_components.tesy_cloud.model import project_device  # noqa: E402
+
+
+def test_project_device_keeps_mac_reported_only_in_state():
+    dev_obj = {"model": "cn06", "token": "abc", "extra": 1, "state": {"mac": "AA:BB", "temp": 20}}
+
+    device = project_device(dev_obj)
+
+    assert device == {"model": "cn06", "token": "abc", "mac": "AA:BB"}
+    assert TesyCloudApi._route(device) == ("AA:BB", "cn06", "abc")
+
+
+def test_project_device_prefers_top_level_mac():
+    dev_obj = {"mac": "AA:BB", "model": "cn06", "token": "abc", "state": {"mac": "CC:DD"}}
+
+    assert project_device(dev_obj)["mac"] == "AA:BB"
+    assert "state" not in project_device(dev_obj, keep_raw=True)
@@ -0,0 +1,210 @@
+"""Tests for the minimal MQTT client, against an in-memory WebSocket broker."""
+
+import asyncio
+
+import aiohttp
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.tesy_cloud.mqtt import (  # noqa: E402
+    TesyMqttClient,
+    TesyMqttError,
+    _encode_str,
+    _packet,
+    _split_packets,
+)
+
+
+class _Message:
+    type = aiohttp.WSMsgType.BINARY
+
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+
+
+class FakeWebSocket:
+    """One broker connection: answers CONNECT/SUBSCRIBE and records every packet."""
+
+    def __init__(self, broker: "FakeBroker") -> None:
+        self.broker = broker
+        self.closed = False
+        self.sent: list[tuple[int, bytes]] = []
+        self._inbox: asyncio.Queue = asyncio.Queue()
+        self._buf = bytearray()
+
+    async def send_bytes(self, data: bytes) -> None:
+        if self.closed:
+            raise ConnectionError("closed")
+        self._buf.extend(data)
+        for header, body in _split_packets(self._buf):
+            self.sent.append((header, body))
+            if header == 0x10:
+                self.feed(_packet(0x20, bytes((0, self.broker.return_code))))
+            elif header == 0x82:
+                self.feed(_packet(0x90, body[:2] + b"\x00"))
+            elif header == 0xC0 and self.broker.answer_pings:
+                self.feed(_packet(0xD0))
+
+    def feed(self, data: bytes) -> None:
+        self._inbox.put_nowait(_Message(data))
+
+    async def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self._inbox.put_nowait(None)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        msg = await self._inbox.get()
+        if msg is None:
+            raise StopAsyncIteration
+        return msg
+
+    def subscribed(self) -> list[str]:
+        topics = []
+        for header, body in self.sent:
+            if header == 0x82:
+                pos = 2
+                while pos < len(body):
+                    length = int.from_bytes(body[pos : pos + 2], "big")
+                    topics.append(body[pos + 2 : pos + 2 + length].decode())
+                    pos += 2 + length + 1
+        return topics
+
+
+class FakeBroker:
+    """Stands in for the aiohttp session: every ws_connect opens a new FakeWebSocket."""
+
+    def __init__(self, return_code: int = 0) -> None:
+        self.return_code = return_code
+        self.answer_pings = True
+        self.connections: list[FakeWebSocket] = []
+
+    async def ws_connect(self, url, **kwargs):
+        ws = FakeWebSocket(self)
+        self.connections.append(ws)
+        return ws
+
+
+def _client(broker: FakeBroker, keepalive: int = 60, on_message=None) -> TesyMqttClient:
+    return TesyMqttClient(
+        broker,
+        url="wss://broker/",
+        client_id="test",
+        username="user",
+        password="pass",
+        keepalive=keepalive,
+        connect_timeout=1,
+        reconnect_min_delay=0.01,
+        reconnect_max_delay=0.05,
+        on_message=on_message,
+    )
+
+
+async def _until(predicate, timeout: float = 2.0) -> None:
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.005)
+
+
+def test_split_packets_multi_byte_lengths():
+    small = _packet(0x30, b"x" * 10)
+    two_bytes = _packet(0x30, b"y" * 200)
+    three_bytes = _packet(0x30, b"z" * 20000)
+    assert two_bytes[1:3] == bytes((0xC8, 0x01))
+    assert len(three_bytes) == 1 + 3 + 20000
+
+    buf = bytearray(small + two_bytes + three_bytes)
+
+    assert _split_packets(buf) == [(0x30, b"x" * 10), (0x30, b"y" * 200), (0x30, b"z" * 20000)]
+    assert buf == bytearray()
+
+
+def test_split_packets_keeps_partial_frames():
+    data = _packet(0x30, b"a" * 300) + _packet(0xD0)
+    buf = bytearray()
+    packets = []
+    for i in range(len(data)):
+        buf.append(data[i])
+        packets.extend(_split_packets(buf))
+        if i == 1:  # only the first byte of a two-byte remaining length
+            assert packets == [] and len(buf) == 2
+
+    assert packets == [(0x30, b"a" * 300), (0xD0, b"")]
+    assert buf == bytearray()
+
+
+def test_split_packets_rejects_overlong_length():
+    with pytest.raises(TesyMqttError):
+        _split_packets(bytearray(b"\x30\xff\xff\xff\xff\x01"))
+
+
+def test_connack_failure_raises_and_backs_off():
+    async def test():
+        broker = FakeBroker(return_code=5)
+        client = _client(broker)
+
+        with pytest.raises(TesyMqttError, match="rc=5"):
+            await client.async_publish("t", "x", timeout=1)
+
+        assert broker.connections[0].closed
+        assert not client.connected
+        assert client._backoff == 0.01
+        await client.async_close()
+
+    asyncio.run(test())
+
+
+def test_publish_and_receive():
+    async def test():
+        received = []
+        broker = FakeBroker()
+        client = _client(broker, on_message=lambda topic, payload: received.append((topic, payload)))
+
+        await client.async_publish("v1/AA/request", '{"a":1}', timeout=1)
+        ws = broker.connections[0]
+        assert ws.sent[-1] == (0x30, _encode_str("v1/AA/request") + b'{"a":1}')
+
+        ws.feed(_packet(0x30, _encode_str("v1/AA/response") + b"ok"))
+        await _until(lambda: received)
+        assert received == [("v1/AA/response", b"ok")]
+        await client.async_close()
+
+    asyncio.run(test())
+
+
+def test_subscriptions_are_restored_after_reconnect():
+    async def test():
+        broker = FakeBroker()
+        client = _client(broker)
+        await client.async_publish("t", "x", timeout=1)
+        await client.async_subscribe(["v1/AA/response/#", "v1/BB/response/#"], timeout=1)
+        assert broker.connections[0].subscribed() == ["v1/AA/response/#", "v1/BB/response/#"]
+
+        await broker.connections[0].close()  # the broker drops the session
+        await _until(lambda: len(broker.connections) == 2 and client.connected)
+
+        assert broker.connections[1].subscribed() == ["v1/AA/response/#", "v1/BB/response/#"]
+        await client.async_close()
+
+    asyncio.run(test())
+
+
+def test_expired_keepalive_closes_the_session():
+    async def test():
+        broker = FakeBroker()
+        broker.answer_pings = False
+        client = _client(broker, keepalive=1)
+        await client.async_publish("t", "x", timeout=1)
+        ws = broker.connections[0]
+
+        await _until(lambda: ws.closed, timeout=3)
+
+        assert (0xC0, b"") in ws.sent  # pinged before giving up
+        assert not client.connected
+        await client.async_close()
+
+    asyncio.run(test())
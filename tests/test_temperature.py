@@ -0,0 +1,35 @@
+"""Tests for the temperature ring buffers."""
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.tesy_cloud.temperature import _Tier  # noqa: E402
+
+
+def _close_buckets(tier, count):
+    for minute in range(count + 1):  # the last sample only closes the previous bucket
+        temp = 20.0 + minute
+        tier.add(minute * 60.0, temp, 1, temp, temp, 21.0)
+
+
+def test_ring_grows_with_closed_buckets():
+    tier = _Tier(60, 5)
+    assert len(tier.starts) == 0
+
+    _close_buckets(tier, 3)
+
+    assert len(tier.starts) == len(tier.setpoints) == 3
+    assert [row[0] for row in tier.rows()] == [0.0, 60.0, 120.0, 180.0]  # plus the open bucket
+
+
+def test_full_ring_overwrites_the_oldest_bucket():
+    tier = _Tier(60, 5)
+
+    _close_buckets(tier, 8)
+
+    assert len(tier.starts) == 5
+    rows = tier.rows()
+    assert [row[0] for row in rows] == [180.0, 240.0, 300.0, 360.0, 420.0, 480.0]
+    assert [row[1] for row in rows] == [23.0, 24.0, 25.0, 26.0, 27.0, 28.0]
+    assert [row[0] for row in tier.rows(since=300.0)] == [300.0, 360.0, 420.0, 480.0]
@@ -0,0 +1,34 @@
+"""Tests for the online thermal model."""
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.tesy_cloud.model import TesyDeviceState  # noqa: E402
+from custom_components.tesy_cloud.thermal import TesyThermalModel  # noqa: E402
+
+
+def _dev(mac, temp):
+    return TesyDeviceState(
+        mac, {"device": {}, "state": {"current_temp": temp, "status": "on", "heating": "on", "watt": 1000}, "name": mac}
+    )
+
+
+def test_only_refitted_rooms_are_checkpointed():
+    model = TesyThermalModel()
+    model.update_all({"AA": _dev("AA", 18.0), "BB": _dev("BB", 20.0)}, 0.0)
+    model.update(_dev("AA", 18.5), 600.0)
+
+    assert model.dirty == {"AA"}
+    assert list(model.to_json(model.dirty)) == ["AA"]
+
+
+def test_partial_checkpoint_merges_over_snapshot():
+    model = TesyThermalModel()
+    room = {"theta": [1.0, 0.0, -0.1], "cov": [[1.0, 0, 0], [0, 1.0, 0], [0, 0, 1.0]], "updates": 20}
+    model.load_json({"AA": room, "BB": room})
+    model.merge_json({"BB": {**room, "updates": 30}})
+
+    stored = model.to_json()
+    assert stored["AA"]["updates"] == 20
+    assert stored["BB"]["updates"] == 30